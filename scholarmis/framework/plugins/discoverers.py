@@ -6,13 +6,12 @@ from pathlib import Path
 from types import ModuleType
 from typing import Dict, List, Optional
 from abc import ABC, abstractmethod
-from importlib import metadata
 from importlib.metadata import Distribution
 from .exceptions import PluginDiscoveryError
 from .metadata import PluginMetadata
 from .extensions import PluginMetadataExtension
 from .mergers import LatestMerge, MergeExtension
-from .utils import compute_file_checksum, get_distribution_checksum
+from .utils import compute_file_checksum, get_distribution_checksum, get_distributions
 
 
 logger = logging.getLogger(__name__)
@@ -259,7 +258,7 @@ class PackageDiscoverer(PluginDiscoverer):
     def discover(self) -> List[PluginMetadata]:
         discovered = []
 
-        for dist in metadata.distributions():
+        for dist in get_distributions():
             dist_name = dist.metadata["Name"].lower()
             if not dist_name.startswith(self.package_prefix):
                 continue
@@ -314,7 +313,7 @@ class EntryPointDiscoverer(PluginDiscoverer):
     def discover(self) -> List[PluginMetadata]:
         discovered: List[PluginMetadata] = []
 
-        for dist in metadata.distributions():
+        for dist in get_distributions():
             package_name = dist.metadata["Name"]
             package_name_lower = package_name.lower()
 
@@ -7,13 +7,14 @@ import sys
 import zipfile
 import requests # type: ignore
 from abc import ABC, abstractmethod
+from dataclasses import replace
 from pathlib import Path
 from typing import Dict, Optional
 from urllib.parse import urlparse
 from .metadata import PluginMetadata
 from .loader import PluginLoader
-from .utils import compute_file_checksum, match_version
-from .pip import pip_upgrade, pip_uninstall, pip_show_version, pip_list_outdated_json
+from .utils import compute_file_checksum, get_distributions, match_version
+from .pip import pip_upgrade, pip_upgrade_many, pip_uninstall, pip_show_version, pip_list_outdated_json
 
 
 logger = logging.getLogger(__name__)
@@ -187,6 +188,7 @@ class PipInstaller(BaseInstaller):
                 stdout=subprocess.PIPE,
                 stderr=subprocess.PIPE,
             )
+            get_distributions.cache_clear()
             plugin = self.loader.discover_plugin(package_name)
             if plugin:
                 return self.finalize(plugin)
@@ -254,32 +256,52 @@ class PluginInstaller(BaseInstaller):
         target = f"{plugin_name}{target_version or ''}"
         try:
             pip_upgrade(target)
-            new_version = pip_show_version(plugin_name)
-            if new_version:
-                plugin.version = new_version
-                # Optionally update pin and checksum
-                plugin.pin = f"=={new_version}"
-                plugin.checksum = compute_file_checksum(Path(plugin.source))
-                self.lock(plugin) 
-                logger.info(f"Plugin {plugin_name} upgraded to version {new_version}.")
-                return plugin
+            return self._record_upgrade(plugin_name, plugin)
         except subprocess.CalledProcessError as e:
             logger.error(f"Failed to upgrade plugin {plugin_name}: {e}")
         return None
     
     def upgrade_all(self):
         """
-        Upgrade a single plugin or all pinned plugins.
-
-        Args:
-            name: Name of the plugin to upgrade. Ignored if all_ is True.
-            all_: If True, upgrade all pinned plugins.
+        Upgrade all plugins tracked in the lockfile with a single pip invocation.
         """
-        plugins = self.lock_file.get_plugins()
+        plugins: Dict[str, PluginMetadata] = {}
+        for pname in self.lock_file.get_plugins():
+            plugin = self.loader.discover_plugin(pname)
+            if plugin:
+                plugins[pname] = plugin
+            else:
+                logger.error(f"Plugin {pname} not found for upgrade.")
 
-        if all:
-            for pname, meta in plugins.items():
-                self.upgrade(pname)
+        if not plugins:
+            return
+
+        try:
+            pip_upgrade_many(list(plugins))
+        except subprocess.CalledProcessError as e:
+            logger.error(f"Failed to upgrade plugins {', '.join(plugins)}: {e}")
+            return
+
+        for pname, plugin in plugins.items():
+            self._record_upgrade(pname, plugin)
+
+    def _record_upgrade(self, plugin_name: str, plugin: PluginMetadata) -> Optional[PluginMetadata]:
+        """
+        Refresh version, pin and checksum of an upgraded plugin and lock it.
+        """
+        new_version = pip_show_version(plugin_name)
+        if new_version:
+            # PluginMetadata is frozen, lock an updated copy
+            plugin = replace(
+                plugin,
+                version=new_version,
+                pin=f"=={new_version}",
+                checksum=compute_file_checksum(Path(plugin.source)),
+            )
+            self.lock(plugin)
+            logger.info(f"Plugin {plugin_name} upgraded to version {new_version}.")
+            return plugin
+        return None
 
     def uninstall(self, plugin_name: str) -> bool:
         """
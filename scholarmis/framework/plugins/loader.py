@@ -1,9 +1,10 @@
 import importlib
-import inspect
+import importlib.util
 import logging
 import sys
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Type
+from types import ModuleType
+from typing import Any, Dict, List, Optional, Tuple, Type
 from scholarmis.framework.exceptions import ServiceAlreadyRegisteredError
 from scholarmis.framework.services import ServiceRegistry
 from .discoverers import CompositeDiscoverer, DefaultDiscoverer, EntryPointDiscoverer, FileSystemDiscoverer, PackageDiscoverer
@@ -23,6 +24,12 @@ class PluginLoader:
         self.service_registry = service_registry
         self.loaded_plugins: Dict[str, PluginMetadata] = {}
 
+        # Cache of (contract, implementation, lifetime) per plugin module name
+        self._module_services_cache: Dict[str, List[Tuple[Type, Type, str]]] = {}
+
+        # Resolved filesystem paths of discovered plugin sources
+        self._resolved_sources: Dict[str, Path] = {}
+
         self.base_dir = Path.cwd()
         self.plugin_dir = self.base_dir / ".plugins"
         self.plugin_dir.mkdir(parents=True, exist_ok=True)
@@ -32,11 +39,14 @@ class PluginLoader:
         self.dependency_validator = DependencyValidator()
         self.checksum_validator = ChecksumValidator(self.lock_file)
 
+        # Filesystem discoverer is shared with the fallback loader
+        self.fs_discoverer = FileSystemDiscoverer([self.plugin_dir])
+
         # Initialize composite discoverer with extensions and semver merge
         self.discoverer = CompositeDiscoverer(
             discoverers=[
                 DefaultDiscoverer(),
-                FileSystemDiscoverer([self.plugin_dir]),
+                self.fs_discoverer,
                 PackageDiscoverer(),
                 EntryPointDiscoverer(),
             ],
@@ -51,20 +61,20 @@ class PluginLoader:
         return self.discoverer.discover()
     
     def discover_plugin(self, identifier: str) -> Optional[PluginMetadata]:
-        # Normalize identifier if it’s a path
-        id_path = Path(identifier).resolve() if Path(identifier).exists() else None
-
         plugin = self.discoverer.find(identifier)
         if plugin:
             return plugin
         
         discovered = self.discoverer.discover()
 
+        # Normalize identifier if it’s a path
+        identifier_path = Path(identifier)
+        id_path = identifier_path.resolve(strict=False) if identifier_path.exists() else None
+
         # If identifier is a path, try matching source path exactly
-        if id_path:
+        if id_path is not None:
             for plugin in discovered:
-                plugin_source = Path(plugin.source).resolve()
-                if plugin_source == id_path:
+                if self._resolve_source(plugin.source) == id_path:
                     return plugin
 
         # fallback: attempt partial name match (zip stem, folder name)
@@ -74,6 +84,14 @@ class PluginLoader:
 
         return None
 
+    def _resolve_source(self, source: str) -> Path:
+        """Resolve a plugin source path once and reuse the result."""
+        resolved = self._resolved_sources.get(source)
+        if resolved is None:
+            resolved = Path(source).resolve(strict=False)
+            self._resolved_sources[source] = resolved
+        return resolved
+
     def validate_plugin(self, plugin: PluginMetadata) -> bool:
         try:
             dependency_valid = self.dependency_validator.validate(plugin, self.loaded_plugins)
@@ -129,6 +147,12 @@ class PluginLoader:
         #     logger.warning(f"Plugin {plugin.name} failed validation and will not be loaded.")
         #     return
 
+        # Reuse an already imported module instead of re-entering the import machinery
+        module = sys.modules.get(plugin.module)
+        if module is not None:
+            self._register_plugin(plugin, module)
+            return
+
         # Attempt standard import first
         try:
             module = importlib.import_module(plugin.module)
@@ -138,21 +162,38 @@ class PluginLoader:
 
     def _fallback_load(self, plugin: PluginMetadata):
         try:
-            fs_discoverer = FileSystemDiscoverer([self.plugin_dir])
-            fs_plugin = fs_discoverer.find(plugin.name)
+            fs_plugin = self.fs_discoverer.find(plugin.name)
             if fs_plugin:
-                plugin_path = str(fs_plugin.source)
-                if plugin_path not in sys.path:
-                    sys.path.insert(0, plugin_path)  # Temporarily add plugin path
-                try:
-                    module = importlib.import_module(fs_plugin.module) 
-                    self._register_plugin(fs_plugin, module)
-                finally:
-                    if plugin_path in sys.path:
-                        sys.path.remove(plugin_path)
+                module = sys.modules.get(fs_plugin.module)
+                if module is None:
+                    module = self._load_from_source(fs_plugin)
+                self._register_plugin(fs_plugin, module)
         except Exception as e2:
             logger.error(f"Failed to load plugin {plugin.name} from plugins directory: {e2}")
 
+    def _load_from_source(self, plugin: PluginMetadata) -> ModuleType:
+        """
+        Loads a plugin package directly from its source folder without
+        mutating sys.path.
+        """
+        source = Path(plugin.source)
+        init_file = source.joinpath(*plugin.module.split("."), "__init__.py")
+        if not init_file.exists():
+            init_file = source / "__init__.py"
+
+        spec = importlib.util.spec_from_file_location(plugin.module, init_file)
+        if spec is None or spec.loader is None:
+            raise ImportError(f"Cannot build an import spec for {plugin.module} from {source}")
+
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[plugin.module] = module
+        try:
+            spec.loader.exec_module(module)
+        except BaseException:
+            sys.modules.pop(plugin.module, None)
+            raise
+        return module
+
     def _register_plugin(self, plugin: PluginMetadata, module: Any):
         self.register_services(module)
         self.loaded_plugins[plugin.name] = plugin
@@ -163,6 +204,7 @@ class PluginLoader:
             return
         plugin = self.loaded_plugins.pop(plugin_name)
         self.unregister_services(plugin)
+        self._module_services_cache.pop(plugin.module, None)
         if plugin.module in sys.modules:
             del sys.modules[plugin.module]
 
@@ -179,23 +221,45 @@ class PluginLoader:
         Scans a loaded plugin module for contracts and their implementations
         and registers them with the ServiceRegistry.
         """
-        for name, obj in inspect.getmembers(plugin_module, inspect.isclass):
-            if inspect.isabstract(obj):
-                # We found a contract (an ABC)
-                contract: Type = obj
-                try:
-                    # Look for a concrete implementation with the same name, without 'I' prefix
-                    # e.g., 'IUserService' -> 'UserService'
-                    impl_name = name[1:] if name.startswith("I") else name
-                    implementation: Type = getattr(plugin_module, impl_name)
-                    
-                    # We can use a convention to determine lifetime, or let the plugin specify
-                    lifetime = getattr(implementation, '__lifetime__', 'singleton')
-                    
-                    self.service_registry.register(contract, implementation, lifetime)
-                    logger.info(f"Auto-registered service {implementation.__name__} for contract {contract.__name__}.")
-                except (AttributeError, TypeError, ServiceAlreadyRegisteredError) as e:
-                    logger.warning(f"Failed to auto-register service for contract {contract.__name__}: {e}")
+        module_name = plugin_module.__name__
+        services = self._module_services_cache.get(module_name)
+        if services is None:
+            services = self._collect_services(plugin_module)
+            self._module_services_cache[module_name] = services
+
+        for contract, implementation, lifetime in services:
+            try:
+                self.service_registry.register(contract, implementation, lifetime)
+                logger.info(f"Auto-registered service {implementation.__name__} for contract {contract.__name__}.")
+            except (TypeError, ServiceAlreadyRegisteredError) as e:
+                logger.warning(f"Failed to auto-register service for contract {contract.__name__}: {e}")
+
+    def _collect_services(self, plugin_module: Any) -> List[Tuple[Type, Type, str]]:
+        """
+        Classifies the contracts (ABCs) of a plugin module and pairs each one
+        with its implementation and lifetime.
+        """
+        services: List[Tuple[Type, Type, str]] = []
+        for name, obj in list(vars(plugin_module).items()):
+            if not isinstance(obj, type):
+                continue
+            if not getattr(obj, "__abstractmethods__", None):
+                continue
+
+            # We found a contract (an ABC)
+            contract: Type = obj
+            try:
+                # Look for a concrete implementation with the same name, without 'I' prefix
+                # e.g., 'IUserService' -> 'UserService'
+                impl_name = name[1:] if name.startswith("I") else name
+                implementation: Type = getattr(plugin_module, impl_name)
+
+                # We can use a convention to determine lifetime, or let the plugin specify
+                lifetime = getattr(implementation, '__lifetime__', 'singleton')
+                services.append((contract, implementation, lifetime))
+            except AttributeError as e:
+                logger.warning(f"Failed to auto-register service for contract {contract.__name__}: {e}")
+        return services
 
     def unregister_services(self, plugin: PluginMetadata):
         """
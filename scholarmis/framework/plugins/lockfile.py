@@ -31,7 +31,7 @@ class LockFile:
         """Saves data to the plugins.lock file."""
         self.lock_file.write_text(json.dumps(data, indent=2), encoding="utf-8")
 
-    def add_plugin(self, name:str, version:str, source, pin:str=None, force:bool=False ):
+    def add_plugin(self, name:str, version:str, source:str, pin:str=None, force:bool=False ):
         data = self.read()
 
         plugin = self.get_plugin(name)
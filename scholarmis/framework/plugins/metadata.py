@@ -5,6 +5,9 @@ from typing import Dict, List, Optional
 from .utils import verbose_case
 
 
+_OFFICIAL_RE = re.compile(r"^scholarmis([_-]|$)", re.IGNORECASE)
+
+
 @dataclass
 class DjangoAppConfig:
     class_name: str
@@ -59,31 +62,42 @@ class PluginMetadata:
     def __post_init__(self):
         # Auto-detect official only if the flag is None
         if self.official is None:
-            is_official = bool(
-                re.match(r"^scholarmis([_-]|$)", self.name, re.IGNORECASE)
-            )
+            is_official = bool(_OFFICIAL_RE.match(self.name))
             object.__setattr__(self, "official", is_official)
 
         # Enforce requires as a list (immutable safety)
         if self.requires is None:
             object.__setattr__(self, "requires", [])
 
+        # Precompute derived values, keyed by the field they derive from
+        # since extensions may still rewrite name/source after construction
+        object.__setattr__(self, "_pkg_label", (self.name, self.name.replace("-", "_")))
+        object.__setattr__(self, "_pkg_path", (self.source, Path(self.source)))
+
     @property
     def pkg_label(self) -> str:
         """Return a normalized package label (safe identifier)."""
-        return self.name.replace("-", "_")
+        name, label = self._pkg_label
+        if name != self.name:
+            label = self.name.replace("-", "_")
+            object.__setattr__(self, "_pkg_label", (self.name, label))
+        return label
 
     @property
     def pkg_path(self) -> Path:
         """Return Path object for the source location."""
-        return Path(self.source)
+        source, path = self._pkg_path
+        if source != self.source:
+            path = Path(self.source)
+            object.__setattr__(self, "_pkg_path", (self.source, path))
+        return path
 
     def to_dict(self) -> dict:
         """Convert metadata to a JSON-safe dictionary."""
         return {
             "name": self.name,
-            "source": str(self.source),
-            "module": str(self.module),
+            "source": self.source,
+            "module": self.module,
             "version": self.version,
             "author": self.author,
             "author_email": self.author_email,
@@ -95,10 +109,11 @@ class PluginMetadata:
 
     @classmethod
     def from_dict(cls, data: Dict) -> 'PluginMetadata':
+        # Lockfile values are already strings, null ones are read as empty
         return cls(
-            name=data.get("name", ""),
-            source=str(data.get("source", "")),
-            module=str(data.get("module", "")),
+            name=data.get("name") or "",
+            source=data.get("source") or "",
+            module=data.get("module") or "",
             version=data.get("version", "unknown"),
             author=data.get("author", None),
             author_email=data.get("author_email", None),
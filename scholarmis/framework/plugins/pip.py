@@ -1,28 +1,49 @@
 import subprocess
 import sys
-from typing import Optional
+from typing import List, Optional
 from pathlib import Path
 from importlib import metadata
+from .utils import get_distributions
 
 
 def pip_install(target: str) -> None:
     subprocess.check_call([sys.executable, "-m", "pip", "install", target])
+    get_distributions.cache_clear()
 
 
 def pip_install_editable(path: Path) -> None:
     subprocess.check_call([sys.executable, "-m", "pip", "install", "-e", str(path)])
+    get_distributions.cache_clear()
 
 
 def pip_install_from_dir(path: Path) -> None:
     subprocess.check_call([sys.executable, "-m", "pip", "install", str(path)])
+    get_distributions.cache_clear()
 
 
 def pip_upgrade(target: str) -> None:
     subprocess.check_call([sys.executable, "-m", "pip", "install", "--upgrade", target])
+    get_distributions.cache_clear()
 
 
 def pip_uninstall(target: str) -> None:
     subprocess.check_call([sys.executable, "-m", "pip", "uninstall", "-y", target])
+    get_distributions.cache_clear()
+
+
+def pip_install_many(targets: List[str]) -> None:
+    subprocess.check_call([sys.executable, "-m", "pip", "install", *targets])
+    get_distributions.cache_clear()
+
+
+def pip_upgrade_many(targets: List[str]) -> None:
+    subprocess.check_call([sys.executable, "-m", "pip", "install", "--upgrade", *targets])
+    get_distributions.cache_clear()
+
+
+def pip_uninstall_many(targets: List[str]) -> None:
+    subprocess.check_call([sys.executable, "-m", "pip", "uninstall", "-y", *targets])
+    get_distributions.cache_clear()
 
 
 def pip_show_version(package: str) -> Optional[str]:
@@ -33,5 +54,5 @@ def pip_show_version(package: str) -> Optional[str]:
 
 
 def pip_list_outdated_json() -> str:
-    out = subprocess.check_output([sys.executable, "-m", "pip", "list", "--outdated", "--format", "json"])
+    out = subprocess.check_output([sys.executable, "-m", "pip", "list", "--outdated", "--format", "json", "--disable-pip-version-check"])
     return out.decode("utf-8")
@@ -1,24 +1,29 @@
-import os
 import re
 import shutil
 import subprocess
 import sys
 import hashlib
 import semver # type: ignore
+from functools import lru_cache
+from importlib import metadata
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional
+
+
+_SPLIT_RE = re.compile(r"[._-]")
+_RECORD_SHA256_RE = re.compile(rb",(sha256=[A-Za-z0-9_-]+)")
 
 
 def pascal_case(name: str) -> str:
     # Split by underscore or dash
-    parts = re.split(r"[._-]", name)
+    parts = _SPLIT_RE.split(name)
     # Capitalize each part
     return "".join(p.capitalize() for p in parts if p)
 
 
 def verbose_case(name: str) -> str:
     # Split by underscore or dash
-    parts = re.split(r"[._-]", name)
+    parts = _SPLIT_RE.split(name)
     # Capitalize each part and join with space
     return " ".join(p.capitalize() for p in parts if p)
 
@@ -73,30 +78,18 @@ def generate_stub(stub_path, output_path, **context):
 
 def generate_stubs(stubs_dir, output_dir, **context):
     """
-    Generates .py files from all .stub files in a directory (except __init__.stub).
+    Generates .py files from all .stub files in a directory.
     Returns a list of generated module names.
     """
-    os.makedirs(output_dir, exist_ok=True)
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
     modules = []
 
-    stub_files = {
-        f.replace(".stub", ""): f
-        for f in os.listdir(stubs_dir)
-        if f.endswith(".stub")
-    }
-
-    for module_name, filename in stub_files.items():
-        stub_path = Path(stubs_dir) / filename
-        output_path = Path(output_dir) / f"{module_name}.py"
-        generate_stub(stub_path, output_path, **context)
+    for stub_path in Path(stubs_dir).glob("*.stub"):
+        module_name = stub_path.stem
+        generate_stub(stub_path, output_dir / f"{module_name}.py", **context)
         modules.append(module_name)
 
-    # Remove generated .py files whose stub no longer exists
-    for module_name in modules:
-        py_path = Path(output_dir) / f"{module_name}.py"
-        if not (Path(stubs_dir) / f"{module_name}.stub").exists() and py_path.exists():
-            py_path.unlink()
-
     return modules
 
 
@@ -147,6 +140,30 @@ def compute_file_checksum(file_path: Path) -> str:
     return f"sha256:{hasher.hexdigest()}"
 
 
+@lru_cache(maxsize=None)
+def get_distributions() -> List[metadata.Distribution]:
+    """
+    Return the installed distributions, scanning site-packages only once.
+    Call get_distributions.cache_clear() after installing or removing packages.
+    """
+    return list(metadata.distributions())
+
+
+@lru_cache(maxsize=512)
+def _record_checksum(record_path: str, mtime: float) -> Optional[str]:
+    """
+    Return the first sha256 entry of a RECORD file.
+    The mtime is part of the cache key so a rewritten RECORD is re-read.
+    """
+    try:
+        blob = Path(record_path).read_bytes()
+    except OSError:
+        return None
+
+    match = _RECORD_SHA256_RE.search(blob)
+    return match.group(1).decode("ascii") if match else None
+
+
 def get_distribution_checksum(dist) -> Optional[str]:
     """
     Extract a checksum from RECORD if available.
@@ -155,17 +172,9 @@ def get_distribution_checksum(dist) -> Optional[str]:
     dist_info_path = Path(dist.locate_file(""))
     record_file = dist_info_path / "RECORD"
 
-    if not record_file.exists():
-        return None
-
     try:
-        with open(record_file, "r", encoding="utf-8") as f:
-            for line in f:
-                parts = line.strip().split(",")
-                if len(parts) >= 2 and parts[1].startswith("sha256="):
-                    return parts[1]
-    except Exception:
+        stat = record_file.stat()
+    except OSError:
         return None
 
-    return None
-
+    return _record_checksum(str(record_file), stat.st_mtime)
@@ -1,4 +1,5 @@
 from abc import ABC, abstractmethod
+from functools import lru_cache
 from typing import Dict, Optional, Tuple
 from .exceptions import PluginDependencyError
 from .lockfile import LockFile
@@ -6,6 +7,16 @@ from .metadata import PluginMetadata
 from .utils import match_version
 
 
+@lru_cache(maxsize=1024)
+def _parse_dependency(dep: str) -> Tuple[str, Optional[str]]:
+    # Simple parsing: "plugin_name >=1.2.3"
+    dep = dep.strip()
+    name, sep, constraint = dep.partition(" ")
+    if sep:
+        return name, constraint.replace(" ", "") or None
+    return dep, None
+
+
 class PluginValidator(ABC):
 
     @abstractmethod
@@ -33,11 +44,7 @@ class DependencyValidator(PluginValidator):
         return True
 
     def parse_dependency(self, dep: str) -> Tuple[str, Optional[str]]:
-        # Simple parsing: "plugin_name >=1.2.3"
-        parts = dep.strip().split(" ")
-        if len(parts) > 1:
-            return parts[0], "".join(parts[1:])
-        return dep, None
+        return _parse_dependency(dep)
 
 
 class ChecksumValidator(PluginValidator):
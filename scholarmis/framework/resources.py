@@ -2,29 +2,242 @@ import os
 import uuid
 import decimal
 import json
+import logging
 import tablib
 import io
+import tempfile
+import time
 import traceback
-from celery import Task
+import zipfile
+from celery import Task, shared_task
 from io import BytesIO
+from xml.sax.saxutils import escape
 from django.forms import ValidationError
 from django.core.files.storage import default_storage
 from slugify import slugify 
 from tablib import Dataset
+from functools import lru_cache, partial
 from datetime import date, datetime, timedelta
 from typing import Dict, List, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
 from django.apps import apps
+from django.conf import settings
+from django.db import close_old_connections, connection
 from django.db.models import Field, Model, QuerySet
 from django.http import HttpResponse, StreamingHttpResponse
+from django.utils.translation import get_language
 from openpyxl.styles import Alignment, Font, PatternFill
 from openpyxl.worksheet.datavalidation import DataValidation
 from openpyxl.utils import get_column_letter
 from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.cell.cell import ILLEGAL_CHARACTERS_RE
+from openpyxl.compat import safe_string
+from openpyxl.utils.exceptions import IllegalCharacterError
 from openpyxl.worksheet.worksheet import Worksheet
 from import_export.resources import ModelResource
 from import_export.widgets import  DateWidget
 from import_export.widgets import  ForeignKeyWidget as BaseForeignKeyWidget
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+logger = logging.getLogger(__name__)
+
+
+# Header styles shared by every header cell
+_HEADER_FONT = Font(size=12, bold=True, color="FFFFFF")
+_HEADER_FILL = PatternFill(start_color="4F81BD", end_color="4F81BD", fill_type="solid")
+_HEADER_ALIGN = Alignment(horizontal="center", vertical="center")
+
+
+_STREAM_CHUNK_SIZE = 64 * 1024
+
+# Rows per server-side cursor fetch when exporting
+_EXPORT_CHUNK_SIZE = 2000
+
+
+class _TemporaryFileChunks:
+    """
+    Iterate a temporary file in chunks for a streaming response. The response closes
+    it when it is done, read or not, and closing removes the file.
+    """
+
+    def __init__(self, path: str, chunk_size: int = _STREAM_CHUNK_SIZE):
+        self.path = path
+        self.chunk_size = chunk_size
+        try:
+            self.file = open(path, "rb")
+        except BaseException:
+            os.remove(path)
+            raise
+
+    def __iter__(self):
+        while chunk := self.file.read(self.chunk_size):
+            yield chunk
+
+    def close(self):
+        self.file.close()
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+
+def _clean_datetime(value):
+    # Format datetime and date objects
+    return value.strftime("%Y-%m-%d %H:%M:%S")
+
+
+# Dates are passed through to default=str so they render as they do with json.dumps
+_ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME if orjson else 0
+
+
+def _clean_json(value):
+    # Convert lists, dictionaries, sets, or tuples to JSON strings
+    if orjson is not None:
+        try:
+            return orjson.dumps(value, default=str, option=_ORJSON_OPTIONS).decode()
+        except TypeError:
+            # orjson rejects some values json accepts, e.g. integers over 64 bits
+            pass
+    try:
+        return json.dumps(value, default=str)
+    except (TypeError, ValueError):
+        return str(value)
+
+
+def _clean_bytes(value):
+    # Convert bytes to a human-readable string
+    try:
+        return value.decode("utf-8")
+    except UnicodeDecodeError:
+        return str(value)
+
+
+def _clean_bool(value):
+    # Represent booleans as "TRUE" or "FALSE"
+    return "TRUE" if value else "FALSE"
+
+
+# Exact type -> cleaner, subclasses fall back to the isinstance chain in clean()
+_CLEANERS = {
+    datetime: _clean_datetime,
+    date: _clean_datetime,
+    uuid.UUID: str,
+    list: _clean_json,
+    dict: _clean_json,
+    set: _clean_json,
+    tuple: _clean_json,
+    decimal.Decimal: float,
+    bytes: _clean_bytes,
+    bool: _clean_bool,
+}
+
+
+# Column letters indexed by 1-based column number, up to Excel's last column XFD
+_COL_LETTER_CACHE = [None] + [get_column_letter(index) for index in range(1, 16385)]
+
+# Exact types written as-is, a column holding only these needs no cleaning
+_PASSTHROUGH_TYPES = frozenset((str, int, float))
+
+# Exact numeric types a column may hold to skip the generic clean() dispatch
+_NUMERIC_TYPES = frozenset((int, float, decimal.Decimal))
+
+
+def _clean_numeric(value):
+    # Decimal is the only numeric type that is not written as-is
+    return float(value) if value.__class__ is decimal.Decimal else value
+
+
+def _get_column_cleaners(dataset: Dataset) -> list:
+    """
+    Pick a cleaner per column from the exact types the column holds. Columns of
+    plain str, int and float values get None and are written without cleaning,
+    all-numeric columns get the numeric cleaner and the rest get clean().
+    """
+    cleaners = []
+    for index in range(dataset.width):
+        column_types = {type(value) for value in dataset.get_col(index)}
+        if column_types <= _PASSTHROUGH_TYPES:
+            cleaners.append(None)
+        elif column_types <= _NUMERIC_TYPES:
+            cleaners.append(_clean_numeric)
+        else:
+            cleaners.append(WorksheetHelper.clean)
+    return cleaners
+
+
+# Part name of the first sheet in a workbook saved by openpyxl
+_MAIN_SHEET_PART = "xl/worksheets/sheet1.xml"
+
+# Excel's limit on the length of a cell's text
+_MAX_CELL_LENGTH = 32767
+
+
+def _cell_xml(reference: str, value) -> str:
+    """Render a cleaned value as a sheet cell, encoded the way openpyxl writes it."""
+    if value is None or value == "":
+        return ""
+    if isinstance(value, (int, float)):
+        return f'<c r="{reference}" t="n"><v>{safe_string(value)}</v></c>'
+
+    value = str(value)
+    if ILLEGAL_CHARACTERS_RE.search(value):
+        raise IllegalCharacterError(f"{value} cannot be used in worksheets.")
+    value = value[:_MAX_CELL_LENGTH]
+    if len(value) > 1 and value.startswith("="):
+        return f'<c r="{reference}"><f>{escape(value[1:])}</f><v /></c>'
+    space = ' xml:space="preserve"' if value.strip() != value else ""
+    return f'<c r="{reference}" t="inlineStr"><is><t{space}>{escape(value)}</t></is></c>'
+
+
+def _iter_row_xml(dataset: Dataset, first_row: int = 2, chunk_rows: int = 1000):
+    """Yield the dataset rows as encoded sheet XML, a chunk of rows at a time."""
+    cleaners = _get_column_cleaners(dataset)
+    letters = _COL_LETTER_CACHE
+    chunk = []
+    for row_number, row in enumerate(dataset, start=first_row):
+        cells = []
+        for col_index, (cleaner, value) in enumerate(zip(cleaners, row), start=1):
+            if cleaner is not None:
+                value = cleaner(value)
+            cells.append(_cell_xml(f"{letters[col_index]}{row_number}", value))
+        chunk.append(f'<row r="{row_number}">{"".join(cells)}</row>')
+        if len(chunk) >= chunk_rows:
+            yield "".join(chunk).encode("utf-8")
+            chunk = []
+    if chunk:
+        yield "".join(chunk).encode("utf-8")
+
+
+def _write_sheet_rows(source, target, dataset: Dataset, sheet_part: str = _MAIN_SHEET_PART):
+    """
+    Copy a saved workbook from source to target, writing the dataset rows into
+    the sheet data of sheet_part after the rows openpyxl already wrote.
+    """
+    with zipfile.ZipFile(source) as source_zip, zipfile.ZipFile(target, "w", zipfile.ZIP_DEFLATED) as target_zip:
+        for info in source_zip.infolist():
+            if info.filename != sheet_part:
+                target_zip.writestr(info, source_zip.read(info))
+                continue
+
+            sheet_xml = source_zip.read(info).decode("utf-8")
+            if "</sheetData>" in sheet_xml:
+                head, tail = sheet_xml.split("</sheetData>", 1)
+            else:
+                head, tail = sheet_xml.split("<sheetData />", 1)
+                head += "<sheetData>"
+            tail = "</sheetData>" + tail
+
+            with target_zip.open(info.filename, "w", force_zip64=True) as sheet_file:
+                sheet_file.write(head.encode("utf-8"))
+                for chunk in _iter_row_xml(dataset):
+                    sheet_file.write(chunk)
+                sheet_file.write(tail.encode("utf-8"))
 
 
 class WorksheetHelper:
@@ -44,33 +257,32 @@ class WorksheetHelper:
         Returns:
             A cleaned value that can be safely written to an Excel worksheet.
         """
+        # Most frequent types first, they are written as-is
+        if value is None:
+            # Replace None with an empty string
+            return ""
+        value_type = type(value)
+        if value_type is str or value_type is int or value_type is float:
+            return value
+
+        cleaner = _CLEANERS.get(value_type)
+        if cleaner is not None:
+            return cleaner(value)
+
+        # Slow path for subclasses of the supported types
         if isinstance(value, (datetime, date)):
-            # Format datetime and date objects
-            return value.strftime("%Y-%m-%d %H:%M:%S")
+            return _clean_datetime(value)
         elif isinstance(value, uuid.UUID):
-            # Convert UUIDs to strings
             return str(value)
         elif isinstance(value, (list, dict, set, tuple)):
-            # Convert lists, dictionaries, sets, or tuples to JSON strings
-            try:
-                return json.dumps(value, default=str)
-            except (TypeError, ValueError):
-                return str(value)
+            return _clean_json(value)
         elif isinstance(value, decimal.Decimal):
             # Convert Decimal to float for Excel compatibility
             return float(value)
         elif isinstance(value, bytes):
-            # Convert bytes to a human-readable string
-            try:
-                return value.decode("utf-8")
-            except UnicodeDecodeError:
-                return str(value)
+            return _clean_bytes(value)
         elif isinstance(value, bool):
-            # Represent booleans as "TRUE" or "FALSE"
-            return "TRUE" if value else "FALSE"
-        elif value is None:
-            # Replace None with an empty string
-            return ""
+            return _clean_bool(value)
         elif isinstance(value, (int, float, str)):
             # Directly return int, float, and string types
             return value
@@ -79,20 +291,24 @@ class WorksheetHelper:
             return str(value)
 
     @staticmethod
-    def style_header_row(sheet):
+    def style_header_row(sheet, headers):
         """
-        Apply styles to the header row (model field names).
+        Append the header row (model field names) with styles applied.
         
         Args:
-            sheet: The worksheet object where the header row styles will be applied.
+            sheet: The write-only worksheet the styled header row will be appended to.
+            headers: The header values.
         """
         sheet.freeze_panes = "A2"  # Freeze the header row to keep it visible while scrolling
-        header = sheet[1]  # Get the first row (header)
-        for cell in header:
+        cells = []
+        for header in headers:
             # Apply font, background color, and alignment to header cells
-            cell.font = Font(size=12, bold=True, color="FFFFFF")
-            cell.fill = PatternFill(start_color="4F81BD", end_color="4F81BD", fill_type="solid")
-            cell.alignment = Alignment(horizontal="center", vertical="center")
+            cell = WriteOnlyCell(sheet, value=header)
+            cell.font = _HEADER_FONT
+            cell.fill = _HEADER_FILL
+            cell.alignment = _HEADER_ALIGN
+            cells.append(cell)
+        sheet.append(cells)
 
     @staticmethod
     def get_for_model(model: Model):
@@ -105,7 +321,7 @@ class WorksheetHelper:
         Returns:
             A string representing a valid sheet name for the model.
         """
-        return model._meta.verbose_name_plural.replace(" ", "_")[:31]
+        return _sheet_name_for_model(model._meta.label, get_language())
 
     @staticmethod
     def get_foreignkey_dataset(field: Field):
@@ -123,28 +339,29 @@ class WorksheetHelper:
         else:
             queryset = field.related_model.objects.all()  # Get all related model instances
 
-        # Create dataset with headers "ID" and "Value"
-        dataset = Dataset(headers=["ID", "Value"])
-        
+        if isinstance(queryset, QuerySet):
+            # Fetch in chunks instead of caching every related instance on the queryset
+            queryset = queryset.iterator(chunk_size=2000)
+
+        rows = []
         index = 0
         for obj in queryset:
-            if isinstance(obj, tuple) and len(obj) >= 2:
-                # Assuming obj is a tuple (id, code), where obj[0] is the ID and obj[1] is the code
-                dataset.append([obj[0], str(obj[1])])  # Append the ID and code from the tuple
-            elif isinstance(obj, list) and len(obj) >= 2:
-                # Assuming obj is a list with the first element as the ID and second element as the code
-                dataset.append([obj[0], str(obj[1])])  # Append the ID and code from the list
+            if isinstance(obj, (tuple, list)) and len(obj) >= 2:
+                # Assuming obj is a tuple or list (id, code), where obj[0] is the ID and obj[1] is the code
+                rows.append((obj[0], str(obj[1])))
             elif hasattr(obj, "pk"):
                 # Handle model instances with a pk attribute
-                dataset.append([obj.pk, str(obj)])  # Append the object's PK and string representation
+                rows.append((obj.pk, str(obj)))
             elif hasattr(obj, "id"):
                 # Handle model instances with an id attribute
-                dataset.append([obj.id, str(obj)])  # Append the object's ID and string representation
+                rows.append((obj.id, str(obj)))
             else:
                 # If the object doesn't have a pk or id, use the index
-                dataset.append([index, str(obj)])
+                rows.append((index, str(obj)))
                 index += 1  # Increment the index
-        return dataset
+
+        # Create dataset with headers "ID" and "Value"
+        return Dataset(*rows, headers=["ID", "Value"])
 
     @staticmethod
     def get_choice_dataset(field: Field):
@@ -164,32 +381,40 @@ class WorksheetHelper:
         return dataset
 
     @staticmethod
-    def add_headers(worksheet: Worksheet, dataset: Dataset, start=1):
+    def add_headers(worksheet: Worksheet, dataset: Dataset):
         """
-        Add headers to the worksheet starting at the given column index.
+        Append the dataset headers as the next row of the worksheet.
         
         Args:
             worksheet: The worksheet to which headers will be added.
             dataset: The dataset containing headers.
-            start: The starting column index for adding headers (default is 1).
         """
-        for col_index, header in enumerate(dataset.headers, start):
-            worksheet.cell(row=1, column=col_index, value=header)  # Add headers to the first row
+        worksheet.append(list(dataset.headers))
 
     @staticmethod
-    def add_rows(worksheet: Worksheet, dataset: Dataset, start=2):
+    def add_rows(worksheet: Worksheet, dataset: Dataset):
         """
-        Add rows of data to the worksheet starting at the given row index.
+        Append rows of data to the worksheet after the rows already written.
         
         Args:
             worksheet: The worksheet to which rows will be added.
             dataset: The dataset containing rows of data.
-            start: The starting row index for adding data (default is 2).
         """
-        for row_index, row in enumerate(dataset.dict, start):
-            for col_index, (key, value) in enumerate(row.items(), start=1):
-                value = WorksheetHelper.clean(value)
-                worksheet.cell(row=row_index, column=col_index, value=value)  # Add data to worksheet cells
+        cleaned_columns = [
+            (index, cleaner) for index, cleaner in enumerate(_get_column_cleaners(dataset))
+            if cleaner is not None
+        ]
+        # Rows come out of the dataset as tuples, only the columns that need it are cleaned
+        if not cleaned_columns:
+            for row in dataset:
+                worksheet.append(row)
+            return
+
+        for row in dataset:
+            values = list(row)
+            for index, cleaner in cleaned_columns:
+                values[index] = cleaner(values[index])
+            worksheet.append(values)
 
     @staticmethod
     def convert_uuid_to_string(value):
@@ -213,6 +438,27 @@ class WorksheetHelper:
         worksheet.protection.set_password(password)  # Set the protection password
 
 
+@lru_cache(maxsize=256)
+def _foreign_key_map(model_label: str) -> Dict[str, Field]:
+    """Map the names of a model's ForeignKey fields to the fields."""
+    model = apps.get_model(model_label)
+    return {field.name: field for field in model._meta.get_fields() if field.is_relation and field.many_to_one}
+
+
+@lru_cache(maxsize=256)
+def _choice_field_map(model_label: str) -> Dict[str, Field]:
+    """Map the names of a model's fields with choices to the fields."""
+    model = apps.get_model(model_label)
+    return {field.name: field for field in model._meta.get_fields() if not field.is_relation and field.choices}
+
+
+@lru_cache(maxsize=1024)
+def _sheet_name_for_model(model_label: str, language: Optional[str]) -> str:
+    """Build a model's sheet name, cached per language as verbose names may be translated."""
+    model = apps.get_model(model_label)
+    return str(model._meta.verbose_name_plural).replace(" ", "_")[:31]
+
+
 class ReferenceField:
     """
     A utility class to handle Reference fields in a Django model.
@@ -234,10 +480,7 @@ class ReferenceField:
             A list of ForeignKey field objects from the model.
         """
         # Get the ForeignKey fields from the model
-        model_fk_fields = {
-            field.name: field for field in model._meta.get_fields()
-            if field.is_relation and field.many_to_one and field.name in fields
-        }
+        model_fk_fields = _foreign_key_map(model._meta.label)
 
         result_fields = []
         foreign_fields = foreign_fields or {}
@@ -271,8 +514,8 @@ class ReferenceField:
         """
         # Get the ChoiceField fields from the model
         model_choice_fields = {
-            field.name: field for field in model._meta.get_fields()
-            if not field.is_relation and field.choices and field.name in fields
+            field_name: field for field_name, field in _choice_field_map(model._meta.label).items()
+            if field_name in fields
         }
 
         # Apply custom choices if provided
@@ -287,9 +530,18 @@ class ReferenceField:
         return list(model_choice_fields.values())
 
 
+@lru_cache(maxsize=128)
+def _list_validation_factory(sheet_name: str, row_count: int):
+    """Build a factory for dropdown validations listing column B of a reference sheet."""
+    # Formula for referencing the range in the reference sheet
+    formula = f"='{sheet_name}'!$B$2:$B${row_count + 1}"
+    return partial(DataValidation, type="list", formula1=formula, allow_blank=True, showDropDown=False)
+
+
 class ExcelExporter:
     PASSWORD = "password"  # Default password for worksheet protection
     MAX_ROW = 1048576  # Maximum number of rows in an Excel sheet
+    DIRECT_XML_MIN_ROWS = 100000  # Above this many rows the data rows are written as XML directly
 
     def __init__(self, model: Model, dataset: Dataset, reference_sheets: Dict[str, Tuple[str, Dataset]], hidden_fields=[], with_data: bool = False, protect: bool=True, export_name=None):
         """
@@ -310,25 +562,24 @@ class ExcelExporter:
         self.export_name = export_name
 
     def build_workbook(self):
-        workbook = Workbook()
+        # Write-only mode streams rows to disk instead of keeping a Cell per value
+        workbook = Workbook(write_only=True)
 
         # Main sheet
         sheet_name = WorksheetHelper.get_for_model(self.model)
-        main_sheet = workbook.active
-        main_sheet.title = sheet_name
-
-        # Write headers to the main sheet
-        WorksheetHelper.add_headers(main_sheet, self.dataset)
-
-        # Apply styles to the header row
-        WorksheetHelper.style_header_row(main_sheet)
-
-        if self.with_data:
-            WorksheetHelper.add_rows(main_sheet, self.dataset, 2)
+        main_sheet = workbook.create_sheet(title=sheet_name)
 
+        # Column visibility must be set before the first row is written
         if len(self.hidden_fields) > 0:
             self._hide_columns(main_sheet, self.hidden_fields)
 
+        # Write the styled header row to the main sheet
+        WorksheetHelper.style_header_row(main_sheet, self.dataset.headers)
+
+        # Large datasets are written straight into the saved file, see _save_workbook
+        if self.with_data and not self._writes_rows_directly():
+            WorksheetHelper.add_rows(main_sheet, self.dataset)
+
         # Add additional sheets for foreign keys and choices
         self._add_sheets(workbook, self.reference_sheets)
 
@@ -354,9 +605,28 @@ class ExcelExporter:
 
         file_path = os.path.join(save_path, file_name)
 
-        workbook.save(file_path)
+        self._save_workbook(workbook, file_path)
         return file_path
 
+    def _writes_rows_directly(self):
+        """Whether the data rows bypass openpyxl and are written to the sheet XML directly."""
+        return self.with_data and len(self.dataset) > self.DIRECT_XML_MIN_ROWS
+
+    def _save_workbook(self, workbook: Workbook, target):
+        """
+        Save the workbook to a path or file object. For large datasets openpyxl saves
+        the workbook without the data rows and the rows are then written into the
+        main sheet's XML, skipping the per-cell objects openpyxl creates.
+        """
+        if not self._writes_rows_directly():
+            workbook.save(target)
+            return
+
+        with tempfile.TemporaryFile() as skeleton:
+            workbook.save(skeleton)
+            skeleton.seek(0)
+            _write_sheet_rows(skeleton, target, self.dataset)
+
     def _hide_columns(self, work_sheet: Worksheet, columns):
         """
         Hide columns in an Excel sheet based on the provided headers.
@@ -366,14 +636,12 @@ class ExcelExporter:
             columns (list): A list of headers (column names) to hide.
         """
         # Map headers to their corresponding column indices
-        header_row = work_sheet[1]  # Assuming headers are in the first row
-        header_map = {cell.value: cell.column for cell in header_row if cell.value}
+        header_map = {header: col_index for col_index, header in enumerate(self.dataset.headers, start=1) if header}
 
         # Process each column to hide and lock
         for header in columns:
             if header in header_map:
-                col_index = header_map[header]
-                col_letter = work_sheet.cell(row=1, column=col_index).column_letter
+                col_letter = _COL_LETTER_CACHE[header_map[header]]
 
                 # Hide the column
                 work_sheet.column_dimensions[col_letter].hidden = True
@@ -390,7 +658,7 @@ class ExcelExporter:
             reference_sheet = workbook.create_sheet(sheet_name)
             # Add headers and rows to the reference sheet
             WorksheetHelper.add_headers(reference_sheet, dataset)
-            WorksheetHelper.add_rows(reference_sheet, dataset, 2)
+            WorksheetHelper.add_rows(reference_sheet, dataset)
             # Protect the sheet with a password
             if self.protect:
                 WorksheetHelper.protect(reference_sheet, self.PASSWORD)
@@ -404,30 +672,23 @@ class ExcelExporter:
             reference_sheets (Dict[str, Tuple[str, Dataset]]): Reference data for foreign keys or choices.
         """
         for col_index, header in enumerate(self.dataset.headers, start=1):
-            column_letter = get_column_letter(col_index)
             field_name = str(header).lower()
 
             # Check if the column header corresponds to a reference field
             if field_name in reference_sheets:
+                column_letter = _COL_LETTER_CACHE[col_index]
                 sheet_name, reference_sheet = reference_sheets[field_name]
-                # Formula for referencing the range in the reference sheet
-                formula = f"='{sheet_name}'!$B$2:$B${len(reference_sheet) + 1}"
-                # Define data validation for the column
-                data_validation = DataValidation(
-                    type="list",
-                    formula1=formula,
-                    allow_blank=True,
-                    showDropDown=False
-                )
+                # Define data validation for the column, a new one each time as it is bound to one sheet
+                data_validation = _list_validation_factory(sheet_name, len(reference_sheet))()
                 # Apply the data validation to the whole column
                 data_validation.sqref = f"{column_letter}2:{column_letter}{self.MAX_ROW}"
-                main_sheet.add_data_validation(data_validation)
+                main_sheet.data_validations.append(data_validation)
 
     def _export(self, workbook: Workbook):
         """Return the workbook as an HTTP response for download."""
         buffer = BytesIO()
         # Save the workbook to an in-memory buffer
-        workbook.save(buffer)
+        self._save_workbook(workbook, buffer)
         buffer.seek(0)
 
         # Generate the file name based on the model's verbose name
@@ -442,11 +703,15 @@ class ExcelExporter:
         return response
     
     def _stream(self, workbook: Workbook):
-        """Return the workbook as an HTTP response for download."""
-        buffer = BytesIO()
-        # Save the workbook to an in-memory buffer
-        workbook.save(buffer)
-        buffer.seek(0)
+        """Return the workbook as a streaming HTTP response for download."""
+        # Save the workbook to a temporary file so only one chunk is held in memory at a time
+        with tempfile.NamedTemporaryFile(delete=False, suffix=".xlsx") as temp_file:
+            try:
+                self._save_workbook(workbook, temp_file)
+            except BaseException:
+                temp_file.close()
+                os.remove(temp_file.name)
+                raise
 
         # Generate the file name based on the model's verbose name
         if self.export_name:
@@ -455,7 +720,7 @@ class ExcelExporter:
             file_name = self._get_file_name(self.model)
 
         # Create and return the HTTP response with the file attachment
-        response = StreamingHttpResponse(buffer, content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet')
+        response = StreamingHttpResponse(_TemporaryFileChunks(temp_file.name), content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet')
         response['Content-Disposition'] = f"attachment; filename={file_name}"
         return response
     
@@ -520,6 +785,22 @@ class ForeignKeyWidget(BaseForeignKeyWidget):
             return None 
 
 
+def _reference_key(field: Field) -> Tuple[str, int]:
+    # The related model and custom queryset a foreign key reference sheet is built from
+    return (field.related_model._meta.label, id(getattr(field, "_custom_queryset", None)))
+
+
+def _get_foreignkey_dataset_in_thread(field: Field, tenant=None) -> Dataset:
+    """Build a foreign key dataset on a worker thread, using the caller's tenant schema."""
+    close_old_connections()
+    try:
+        if tenant is not None and hasattr(connection, "set_tenant"):
+            connection.set_tenant(tenant)
+        return WorksheetHelper.get_foreignkey_dataset(field)
+    finally:
+        connection.close()
+
+
 class BaseResource(ModelResource):
     """
     A class for exporting data from a Django model into a structured format such as XLSX.
@@ -580,6 +861,59 @@ class BaseResource(ModelResource):
     def set_export_name(self, name):
         self.export_name = name
 
+    def get_chunk_size(self):
+        """
+        Rows fetched per round trip when the export queryset is iterated. Unless
+        Meta.chunk_size or IMPORT_EXPORT_CHUNK_SIZE say otherwise, fetch more than
+        django-import-export's default of 100.
+        """
+        if self._meta.chunk_size is None and not hasattr(settings, "IMPORT_EXPORT_CHUNK_SIZE"):
+            return _EXPORT_CHUNK_SIZE
+        return super().get_chunk_size()
+
+    def filter_export(self, queryset, **kwargs):
+        """
+        Join the exported foreign keys in the same query and only load
+        the columns that are exported.
+
+        Done here rather than in get_queryset, which imports also use to look up
+        existing rows; saving a row loaded with only() would write just those columns.
+        """
+        queryset = super().filter_export(queryset, **kwargs)
+        if not isinstance(queryset, QuerySet):
+            return queryset
+
+        foreignkey_names = [field.name for field in self.foreignkey_fields]
+        if foreignkey_names:
+            queryset = queryset.select_related(*foreignkey_names)
+
+        # only() replaces an existing projection, so leave querysets that set their own
+        only_fields = self._get_only_fields()
+        if only_fields and queryset.query.deferred_loading == (frozenset(), True):
+            queryset = queryset.only(*only_fields)
+        return queryset
+
+    def _get_only_fields(self) -> List[str]:
+        """
+        Get the model columns read by the export. Returns an empty list when an
+        exported field is not a plain concrete field, since deferring the columns
+        a dehydrate method or custom attribute reads would cost a query per row.
+        """
+        concrete_fields = {}
+        for model_field in self.model._meta.concrete_fields:
+            concrete_fields[model_field.name] = model_field.name
+            concrete_fields[model_field.attname] = model_field.name
+
+        only_fields = []
+        for field_name, field in self.fields.items():
+            dehydrate_method = field.get_dehydrate_method(field_name)
+            if callable(dehydrate_method) or hasattr(self, dehydrate_method):
+                return []
+            if field.attribute not in concrete_fields:
+                return []
+            only_fields.append(concrete_fields[field.attribute])
+        return only_fields
+
     
     def get_exporter(self, queryset=None, *args, **kwargs):
         # Prepare the main dataset
@@ -613,54 +947,48 @@ class BaseResource(ModelResource):
     
     def _create_reference_sheets(self):
         """
-        Create additional sheets by combining ForeignKey reference fields and Choice fields.
-        """
-        foreignkey_sheets = self._create_foreignkey_sheets()
-        choice_sheets = self._create_choice_sheets()
-        reference_sheets = {**foreignkey_sheets, **choice_sheets}
-        return reference_sheets
-
-    def _create_foreignkey_sheets(self):
-        """
-        Create additional sheets for ForeignKey reference fields.
-
-        Args:
-            foreignkey_fields (List[Field]): A list of ForeignKey fields to process.
+        Create additional sheets for ForeignKey reference fields and choice fields.
 
         Returns:
             Dict[str, Tuple[str, Dataset]]: A dictionary where the key is the field name and the value is a tuple
-                                           containing the sheet name and dataset for the foreign key.
+                                           containing the sheet name and dataset for the field.
         """
+        foreignkey_datasets = self._get_foreignkey_datasets()
+        references = [
+            # Foreign key sheets are named after the related model
+            *((field, WorksheetHelper.get_for_model(field.remote_field.model), foreignkey_datasets[_reference_key(field)])
+              for field in self.foreignkey_fields),
+            # Choice sheets are named after the field (limited to 31 characters)
+            *((field, field.name[:31], WorksheetHelper.get_choice_dataset(field))
+              for field in self.choice_fields),
+        ]
+
         reference_sheets = {}
-        for field in self.foreignkey_fields:
-            # Get the dataset for each ForeignKey field
-            dataset = WorksheetHelper.get_foreignkey_dataset(field)
+        for field, sheet_name, dataset in references:
             if dataset:
-                # Generate the sheet name from the related model's name
-                sheet_name = WorksheetHelper.get_for_model(field.remote_field.model)
                 reference_sheets[field.name.lower()] = (sheet_name, dataset)
         return reference_sheets
 
-    def _create_choice_sheets(self):
+    def _get_foreignkey_datasets(self) -> Dict[Tuple[str, int], Dataset]:
+        """
+        Fetch the datasets for the ForeignKey reference fields. Fields pointing at the
+        same model with the same queryset share one dataset per export.
         """
-        Create additional sheets for choice fields.
+        pending = {}
+        for field in self.foreignkey_fields:
+            pending.setdefault(_reference_key(field), field)
 
-        Args:
-            choice_fields (List[Field]): A list of choice fields to process.
+        if len(pending) <= 1:
+            return {key: WorksheetHelper.get_foreignkey_dataset(field) for key, field in pending.items()}
 
-        Returns:
-            Dict[str, Tuple[str, Dataset]]: A dictionary where the key is the field name and the value is a tuple
-                                           containing the sheet name and dataset for the choice field.
-        """
-        reference_sheets = {}
-        for field in self.choice_fields:
-            # Get the dataset for each choice field
-            dataset = WorksheetHelper.get_choice_dataset(field)
-            if dataset:
-                # Generate the sheet name from the field name (limited to 31 characters)
-                sheet_name = field.name[:31]
-                reference_sheets[field.name.lower()] = (sheet_name, dataset)
-        return reference_sheets
+        # Run the reference queries concurrently, each thread on its own connection
+        tenant = getattr(connection, "tenant", None)
+        with ThreadPoolExecutor(max_workers=min(8, len(pending))) as executor:
+            futures = {
+                key: executor.submit(_get_foreignkey_dataset_in_thread, field, tenant)
+                for key, field in pending.items()
+            }
+            return {key: future.result() for key, future in futures.items()}
 
     def is_blank(self):
         """
@@ -669,8 +997,7 @@ class BaseResource(ModelResource):
         Returns:
             bool: True if the model has no records, False otherwise.
         """
-        model = apps.get_model(self.app_label, self.model_name)
-        return model.objects.count() == 0
+        return not self.model.objects.exists()
 
     def is_filled(self):
         """
@@ -679,7 +1006,7 @@ class BaseResource(ModelResource):
         Returns:
             bool: True if the model has records, False if it is empty.
         """
-        return not self.is_blank()
+        return self.model.objects.exists()
 
     def import_file(self,file, format="xlsx", raise_errors=False):
         dataset = tablib.Dataset().load(file, format)
@@ -687,7 +1014,45 @@ class BaseResource(ModelResource):
         return result
 
 
+class _DatasetView(tablib.Dataset):
+    """
+    A dataset over a slice of another dataset's rows, set directly instead of through
+    extend() so the headers are set once and the rows are not validated again. Each
+    row is copied, since before_import hooks may change the batch's columns or rows.
+    """
+
+    def __init__(self, parent: tablib.Dataset, start: int, end: int):
+        super().__init__(headers=parent.headers)
+        self._data = [row.copy() for row in parent._data[start:end]]
+
+
+# Cell values that count as empty when filtering imported rows
+_EMPTY_CELLS = (None, '', ' ')
+_EMPTY_CELL_SET = frozenset(_EMPTY_CELLS)
+
+
+# Import status messages; progress is a whole percent, so its messages are built once
+_PROGRESS_MESSAGES = tuple(f"Importing records. {progress}% completed." for progress in range(101))
+_COMPLETED_MESSAGE = "Task completed. Imported {} records."
+_FAILED_MESSAGE = "Error during import: {}"
+
+
+@shared_task(ignore_result=True)
+def _cleanup_upload(file_path: str):
+    """
+    Delete an uploaded import file from the file system.
+    """
+    try:
+        os.remove(file_path)
+    except FileNotFoundError:
+        pass
+    except Exception:
+        logger.exception("Error deleting uploaded file %s", file_path)
+
+
 class ResourceImport:
+    cleanup_queue = None  # Queue for the file clean up task, the default queue if None
+    progress_interval = 0.5  # Minimum seconds between progress updates sent to the result backend
 
     def __init__(self, task: Task, resource: BaseResource, file_path: str, user, raise_errors=True):
         """
@@ -703,11 +1068,14 @@ class ResourceImport:
         self.user = user
         self.raise_errors = raise_errors
         self.file_content, self.file_format = self.read_excel_file(file_path)  # Read file content
-        self.dataset = tablib.Dataset().load(self.file_content, self.file_format)  # Load the dataset
+        with self.file_content:
+            self.dataset = tablib.Dataset().load(self.file_content, self.file_format)  # Load the dataset
 
         self.dataset = self.filter(self.dataset)
         self.headers = self.dataset.headers
         self.notifier: callable = None
+        self._last_reported_progress = -1
+        self._last_reported_time = 0.0
     
     def set_notifier(self, notifier: callable):
         self.notifier = notifier
@@ -718,8 +1086,12 @@ class ResourceImport:
         
         # Read the file and load into an appropriate in-memory stream
         if file_extension in ['.xlsx', '.xls']:
-            with open(file_path, 'rb') as f:
-                in_stream = io.BytesIO(f.read(size))
+            if size is None:
+                # The file object is seekable, so the workbook is read from disk instead of copied into memory
+                in_stream = open(file_path, 'rb')
+            else:
+                with open(file_path, 'rb') as f:
+                    in_stream = io.BytesIO(f.read(size))
             file_format = file_extension.lstrip('.')
         elif file_extension == '.csv':
             with open(file_path, 'r', encoding='utf-8') as f:
@@ -732,11 +1104,19 @@ class ResourceImport:
 
 
     def filter(self, dataset: tablib.Dataset):
-        # Filter out empty rows
-        return tablib.Dataset(
-            *[row for row in dataset if any(cell not in (None, '', ' ') for cell in row)],
-            headers=dataset.headers
-        )
+        # Filter out empty rows, copying only the rows that are kept
+        filtered = tablib.Dataset(headers=dataset.headers)
+        for row in dataset:
+            try:
+                # Checked in C, stops at the first cell that is not empty
+                if _EMPTY_CELL_SET.issuperset(row):
+                    continue
+            except TypeError:
+                # Unhashable cells are compared one by one
+                if all(cell in _EMPTY_CELLS for cell in row):
+                    continue
+            filtered.append(row)
+        return filtered
 
     def run(self):
         try:
@@ -745,10 +1125,7 @@ class ResourceImport:
 
             for start in range(0, total_rows, batch_size):
                 end = min(start + batch_size, total_rows)
-                batch = self.dataset[start:end]
-
-                dataset = tablib.Dataset(headers=self.headers)
-                dataset.extend(batch)
+                dataset = _DatasetView(self.dataset, start, end)
 
                 self.resource.import_data(
                     dataset=dataset, 
@@ -756,38 +1133,51 @@ class ResourceImport:
                 )
                 
                 progress = round((end / total_rows) * 100)
-                message = f"Importing records. {progress}% completed."
-                self.task.update_state(state="PROGRESS", meta={"progress": progress, "message": message})
+                self._report_progress(progress)
 
-            message = f"Task completed. Imported {total_rows} records."
+            message = _COMPLETED_MESSAGE.format(total_rows)
             self.task.update_state(state="SUCCESS", meta={"progress": 100, "message": message})
             if self.notifier:
                 self.notifier(self.user, message)
             self.clean_up()
 
         except ImportError as e:
-            error_trace = traceback.format_exc()
-            message = f"Error during import: {e}"
-
-            self.task.update_state(
-                state="FAILURE",
-                meta={
-                    "exc_type": type(e).__name__,
-                    "exc_message": str(e),
-                    "traceback": error_trace,
-                    "progress": 100,
-                    "message": message
-                }
-            )
+            # The full traceback goes to the log, the result backend gets a compact summary
+            logger.exception("Import of %s failed", self.file_path)
+            message = _FAILED_MESSAGE.format(e)
+
+            meta = {
+                "exc_type": type(e).__name__,
+                "exc_message": str(e),
+                "progress": 100,
+                "message": message
+            }
+            if settings.DEBUG:
+                meta["traceback"] = traceback.format_exc()
+
+            self.task.update_state(state="FAILURE", meta=meta)
             self.clean_up()
 
+    def _report_progress(self, progress: int):
+        """
+        Send the import progress to the result backend, at most once per percent
+        and once per progress_interval seconds.
+        """
+        now = time.monotonic()
+        if progress - self._last_reported_progress < 1 or now - self._last_reported_time < self.progress_interval:
+            return
+
+        self._last_reported_progress = progress
+        self._last_reported_time = now
+        self.task.update_state(state="PROGRESS", meta={"progress": progress, "message": _PROGRESS_MESSAGES[progress]})
+
     def clean_up(self):
         """
-        Clean up the uploaded file after processing.
+        Clean up the uploaded file after processing. The file is deleted by a separate
+        task so a slow filesystem doesn't hold this worker.
         """
-        if os.path.exists(self.file_path):
-            try:
-                # Delete the file from the file system
-                os.remove(self.file_path)
-            except Exception as e:
-                print(f"Error deleting file: {e}")
+        try:
+            _cleanup_upload.apply_async(args=[self.file_path], queue=self.cleanup_queue)
+        except Exception:
+            logger.warning("Error scheduling clean up of %s, deleting inline", self.file_path, exc_info=True)
+            _cleanup_upload(self.file_path)
@@ -1,21 +1,115 @@
-from django.db.models import QuerySet # type: ignore
+from functools import reduce
+from operator import and_, or_
+from django.core.exceptions import FieldDoesNotExist # type: ignore
+from django.db.models import F, Q, QuerySet # type: ignore
+from django.db.models.constants import LOOKUP_SEP # type: ignore
+
+
+# DRF search_fields prefixes and the lookups they stand for
+_LOOKUP_PREFIXES = {
+    "^": "istartswith",
+    "=": "iexact",
+    "@": "search",
+    "$": "iregex",
+}
 
 
 class SearchQuery:
     query_param = "query"  # Default query parameter name
+    search_fields = []  # Fields matched against the query, with DRF's ^ = @ $ prefixes
+    search_vector_field = None  # Optional PostgreSQL SearchVectorField ranked against the query
 
     def get_queryset(self) -> QuerySet:
-        # Fetch the original queryset
-        queryset = super().get_queryset()
-
         # Get the value of the query parameter
         query_value = self.request.GET.get(self.query_param, "").strip()
 
-        # If the query is empty, return an empty queryset
+        # If the query is empty, return an empty queryset without building the view's queryset
         if not query_value:
-            return queryset.none()
+            if self.queryset is not None:
+                return self.queryset.none()
+            return super().get_queryset().none()
+
+        # Fetch the original queryset
+        queryset = super().get_queryset()
+
+        if self.search_vector_field:
+            return self._rank_queryset(queryset, query_value)
+
+        if self.search_fields:
+            queryset = queryset.filter(self._get_search_filter(query_value))
+            # A match through a to-many relation returns the row once per matching related row
+            if self._must_call_distinct(queryset):
+                queryset = queryset.distinct()
+            return queryset
 
-        # Return the original queryset if the query is not empty
+        # Without search fields the filtering is left to the view's filter backends
         return queryset
 
+    def _get_search_filter(self, query_value: str) -> Q:
+        """
+        Build the filter for the query, every term has to match at least one of the search fields.
+        """
+        lookups = []
+        for field in self.search_fields:
+            lookup = _LOOKUP_PREFIXES.get(field[0])
+            if lookup:
+                lookups.append(f"{field[1:]}__{lookup}")
+            else:
+                lookups.append(f"{field}__icontains")
+
+        return reduce(and_, (
+            reduce(or_, (Q(**{lookup: term}) for lookup in lookups))
+            for term in query_value.split()
+        ))
+
+    def _must_call_distinct(self, queryset: QuerySet) -> bool:
+        """
+        Whether any search field follows a many-to-many or reverse foreign key relation.
+        """
+        for field in self.search_fields:
+            if field[0] in _LOOKUP_PREFIXES:
+                field = field[1:]
+            opts = queryset.model._meta
+            for part in field.split(LOOKUP_SEP):
+                try:
+                    model_field = opts.get_field(part)
+                except FieldDoesNotExist:
+                    # The rest of the path is a lookup or transform
+                    break
+                if model_field.many_to_many or model_field.one_to_many:
+                    return True
+                if not model_field.is_relation:
+                    break
+                opts = model_field.related_model._meta
+        return False
+
+    def _rank_queryset(self, queryset: QuerySet, query_value: str) -> QuerySet:
+        """
+        Match the query against the search vector field and order by rank, using its GIN index.
+        """
+        from django.contrib.postgres.search import SearchQuery as PostgresSearchQuery, SearchRank
+
+        search_query = PostgresSearchQuery(query_value)
+        return queryset.annotate(
+            rank=SearchRank(F(self.search_vector_field), search_query)
+        ).filter(**{self.search_vector_field: search_query}).order_by("-rank")
+
+
+class EagerLoading:
+    """
+    Load the relations nested by the view's serializer together with the queryset.
+    Serializers that define setup_eager_loading (see NestedSerializer) decide what
+    is joined or prefetched, limited to the comma separated fields_param if given.
+    """
+    fields_param = "fields"  # Default query parameter for the requested fields
+
+    def get_queryset(self) -> QuerySet:
+        queryset = super().get_queryset()
+
+        serializer_class = self.get_serializer_class()
+        if not hasattr(serializer_class, "setup_eager_loading"):
+            return queryset
 
+        fields = self.request.GET.get(self.fields_param, "").strip()
+        requested = [field.strip() for field in fields.split(",") if field.strip()] if fields else None
+        return serializer_class.setup_eager_loading(queryset, requested)
@@ -1,107 +1,400 @@
+import sys
+from contextvars import ContextVar
+from functools import lru_cache
 from rest_framework import serializers
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework import status
-from django.db import models
-from django.core.exceptions import ImproperlyConfigured
+from rest_framework.relations import MANY_RELATION_KWARGS
+from django.db import models, transaction
+from django.core.exceptions import FieldDoesNotExist, ImproperlyConfigured
+from django.core.exceptions import ValidationError as DjangoValidationError
+
+
+# Kinds of nested relation, deciding which write field is attached next to the nested one
+_FOREIGN_KEY = "foreign_key"
+_MANY_TO_MANY = "many_to_many"
+_MANY_TO_MANY_THROUGH = "many_to_many_through"
+
+# Serializer classes whose nested fields are being attached, so a relation cycle stops
+_expanding: ContextVar[frozenset] = ContextVar("nested_serializers_expanding", default=frozenset())
+
+
+@lru_cache(maxsize=None)
+def _get_relation_fields(model):
+    """
+    Get a model's forward ForeignKey/OneToOneField fields and its ManyToManyField fields.
+    """
+    foreign_key_fields = tuple(
+        field for field in model._meta.get_fields()
+        if field.concrete and (field.many_to_one or field.one_to_one)
+    )
+    return foreign_key_fields, tuple(model._meta.many_to_many)
+
+
+class BulkManyRelatedField(serializers.ManyRelatedField):
+    """
+    A many related field that looks up all the submitted primary keys in one query.
+    """
+
+    def to_internal_value(self, data):
+        child = self.child_relation
+        if isinstance(data, str) or not hasattr(data, "__iter__") or child.pk_field is not None:
+            return super().to_internal_value(data)
+        if not self.allow_empty and len(data) == 0:
+            self.fail("empty")
+
+        queryset = child.get_queryset()
+        pk_field = queryset.model._meta.pk
+        pks = []
+        for item in data:
+            try:
+                if isinstance(item, bool):
+                    raise TypeError
+                pks.append(pk_field.to_python(item))
+            except (TypeError, ValueError, DjangoValidationError):
+                child.fail("incorrect_type", data_type=type(item).__name__)
+
+        try:
+            objects = queryset.in_bulk(pks)
+        except TypeError:
+            # Sliced or distinct querysets cannot be read with in_bulk
+            return super().to_internal_value(data)
+
+        result = []
+        for item, pk in zip(data, pks):
+            obj = objects.get(pk)
+            if obj is None:
+                child.fail("does_not_exist", pk_value=item)
+            result.append(obj)
+        return result
+
+
+class BulkPrimaryKeyRelatedField(serializers.PrimaryKeyRelatedField):
+    """
+    A primary key related field that, with many=True, validates the whole list with a
+    single IN query instead of one query per primary key.
+    """
+
+    @classmethod
+    def many_init(cls, *args, **kwargs):
+        list_kwargs = {"child_relation": cls(*args, **kwargs)}
+        for key in kwargs:
+            if key in MANY_RELATION_KWARGS:
+                list_kwargs[key] = kwargs[key]
+        return BulkManyRelatedField(**list_kwargs)
 
 
 class NestedSerializer(serializers.ModelSerializer):
     class Meta:
         abstract = True
         serializers = {}  # Optional override
+        auto_nested = False  # Also nest relations to models with a single serializer in this module
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self._attach_nested_fields()
 
-    def _attach_nested_fields(self):
-        model = getattr(getattr(self, "Meta", None), "model", None)
+    @classmethod
+    def _get_nested_relations(cls):
+        """
+        Get the (model field, serializer class) pairs of the relations serialized as nested.
+        """
+        model = getattr(getattr(cls, "Meta", None), "model", None)
         if model is None:
-            raise ImproperlyConfigured(f"{self.__class__.__name__} must define Meta.model")
+            raise ImproperlyConfigured(f"{cls.__name__} must define Meta.model")
 
-        meta_fields = list(getattr(self.Meta, "fields", []))
-        nested_map = getattr(self.Meta, "serializers", {})
+        nested_map = getattr(cls.Meta, "serializers", {})
+        auto_nested = getattr(cls.Meta, "auto_nested", False)
 
-        for field in model._meta.get_fields():
-            if not isinstance(field, (models.ForeignKey, models.OneToOneField, models.ManyToManyField)):
-                continue
+        foreign_key_fields, many_to_many_fields = _get_relation_fields(model)
 
-            field_name = field.name
-            serializer_class = nested_map.get(field_name)
+        relations = []
+        for field in foreign_key_fields + many_to_many_fields:
+            serializer_class = nested_map.get(field.name)
 
             if serializer_class is None:
-                serializer_class_name = f"{field_name.capitalize()}Serializer"
-                serializer_class = globals().get(serializer_class_name)
+                if not auto_nested:
+                    continue
+                serializer_class = cls._get_auto_serializers().get(field.related_model)
                 if serializer_class is None:
                     continue
 
-            # Read-only nested
-            if isinstance(field, models.ManyToManyField):
-                self.fields[field_name] = serializer_class(many=True, read_only=True)
+            relations.append((field, serializer_class))
+        return relations
+
+    @classmethod
+    def _get_auto_serializers(cls):
+        """
+        Map models to the model serializers defined next to this serializer, used with
+        Meta.auto_nested for relations missing from Meta.serializers. Models with more
+        than one serializer in the module are left out, as are the models of this
+        serializer itself.
+        """
+        auto_serializers = cls.__dict__.get("_auto_serializers")
+        if auto_serializers is not None:
+            return auto_serializers
+
+        # Read when first needed, the module is fully loaded by then
+        module = sys.modules.get(cls.__module__)
+        candidates = {}
+        for value in vars(module).values() if module else ():
+            if not isinstance(value, type) or not issubclass(value, serializers.ModelSerializer) or value is cls:
+                continue
+            model = getattr(getattr(value, "Meta", None), "model", None)
+            if model is not None:
+                candidates.setdefault(model, []).append(value)
+
+        cls._auto_serializers = {
+            model: classes[0] for model, classes in candidates.items() if len(classes) == 1
+        }
+        return cls._auto_serializers
+
+    @classmethod
+    def get_eager_loading(cls, prefix="", many=False, seen=None):
+        """
+        Get the select_related and prefetch_related lookups for the nested relations,
+        following nested serializers that are NestedSerializers themselves.
+
+        Relations under a many-to-many relation can only be prefetched.
+        """
+        seen = (seen or set()) | {cls}
+        select_related, prefetch_related = [], []
+
+        for field_name, kind, serializer_class, _ in cls._get_nested_spec():
+            lookup = f"{prefix}{field_name}"
+            field_many = many or kind != _FOREIGN_KEY
+
+            if field_many:
+                prefetch_related.append(lookup)
             else:
-                self.fields[field_name] = serializer_class(read_only=True)
+                select_related.append(lookup)
+
+            if isinstance(serializer_class, type) and issubclass(serializer_class, NestedSerializer) and serializer_class not in seen:
+                child_select, child_prefetch = serializer_class.get_eager_loading(f"{lookup}__", field_many, seen)
+                select_related.extend(child_select)
+                prefetch_related.extend(child_prefetch)
 
-            if field_name not in meta_fields:
-                meta_fields.append(field_name)
+        return select_related, prefetch_related
 
+    @classmethod
+    def get_only_fields(cls):
+        """
+        Get the names of the model fields the serializer reads, for narrowing the
+        queryset with only(). Nested foreign keys are always included so joining
+        them does not defer their column. None means the columns cannot be told
+        from Meta.fields, as with "__all__" or declared and non-model fields.
+        """
+        if "_only_fields" in cls.__dict__:
+            return cls._only_fields
+
+        model = cls.Meta.model
+        meta_fields = getattr(cls.Meta, "fields", None)
+        only_fields = None
+
+        if isinstance(meta_fields, (list, tuple)):
+            only_fields = []
+            for name in meta_fields:
+                if name == "pk":
+                    continue
+                try:
+                    field = model._meta.get_field(name)
+                except FieldDoesNotExist:
+                    field = None
+                if field is None or name in cls._declared_fields:
+                    only_fields = None
+                    break
+                # Many-to-many and reverse relations have no column of their own
+                if field.concrete and not field.many_to_many and field.name not in only_fields:
+                    only_fields.append(field.name)
+
+        if only_fields is not None:
+            for field_name, kind, _, _ in cls._get_nested_spec():
+                if kind == _FOREIGN_KEY and field_name not in only_fields:
+                    only_fields.append(field_name)
+            only_fields = tuple(only_fields)
+
+        cls._only_fields = only_fields
+        return only_fields
+
+    @classmethod
+    def _get_only_loading(cls, prefix="", many=False, seen=None):
+        """
+        Get the only() paths of the joined relations and the only() fields of each
+        prefetched relation, following get_eager_loading.
+        """
+        seen = (seen or set()) | {cls}
+        only_paths, prefetch_only = [], {}
+
+        for field_name, kind, serializer_class, model_class in cls._get_nested_spec():
+            if not isinstance(serializer_class, type) or not issubclass(serializer_class, NestedSerializer) or serializer_class in seen:
+                continue
+
+            lookup = f"{prefix}{field_name}"
+            field_many = many or kind != _FOREIGN_KEY
+            child_only = serializer_class.get_only_fields()
+
+            if child_only is not None:
+                if field_many:
+                    prefetch_only[lookup] = (model_class, child_only)
+                else:
+                    only_paths.extend(f"{lookup}__{name}" for name in child_only)
+
+            child_paths, child_prefetch = serializer_class._get_only_loading(f"{lookup}__", field_many, seen)
+            # Joined paths of a child without its own projection would restrict its model
+            if child_only is not None:
+                only_paths.extend(child_paths)
+            prefetch_only.update(child_prefetch)
+
+        return only_paths, prefetch_only
+
+    @classmethod
+    def setup_eager_loading(cls, queryset, fields=None):
+        """
+        Join or prefetch the nested relations on the queryset, so serializing a list
+        does not query once per row. If fields is given, only the relations under
+        those top-level field names are loaded.
+
+        When the columns are known from Meta.fields, the queryset and the prefetched
+        relations are also narrowed with only(), unless the queryset already defers.
+        """
+        select_related, prefetch_related = cls.get_eager_loading()
+        only_fields = cls.get_only_fields()
+        only_paths, prefetch_only = cls._get_only_loading()
+
+        if fields is not None:
+            fields = set(fields)
+            select_related = [lookup for lookup in select_related if lookup.split("__", 1)[0] in fields]
+            prefetch_related = [lookup for lookup in prefetch_related if lookup.split("__", 1)[0] in fields]
+            only_paths = [path for path in only_paths if path.split("__", 1)[0] in fields]
+
+        if select_related:
+            queryset = queryset.select_related(*select_related)
+        if prefetch_related:
+            queryset = queryset.prefetch_related(*[
+                models.Prefetch(lookup, queryset=prefetch_only[lookup][0].objects.only(*prefetch_only[lookup][1]))
+                if lookup in prefetch_only else lookup
+                for lookup in prefetch_related
+            ])
+
+        # only() replaces an existing projection, so leave querysets that set their own
+        if only_fields is not None and queryset.query.deferred_loading == (frozenset(), True):
+            queryset = queryset.only(*only_fields, *only_paths)
+        return queryset
+
+    @classmethod
+    def _get_nested_spec(cls):
+        """
+        Get the (field name, kind, serializer class, related model) specifications of the
+        nested relations. They only depend on the class, so they are built once per class.
+        """
+        spec = cls.__dict__.get("_nested_spec")
+        if spec is not None:
+            return spec
+
+        spec = []
+        for field, serializer_class in cls._get_nested_relations():
             model_class = getattr(getattr(serializer_class, "Meta", None), "model", None)
             if model_class is None:
                 raise ImproperlyConfigured(f"Cannot derive queryset for {serializer_class.__name__}. Ensure it defines Meta.model.")
 
+            if not isinstance(field, models.ManyToManyField):
+                kind = _FOREIGN_KEY
+            elif field.remote_field.through._meta.auto_created:
+                kind = _MANY_TO_MANY
+            else:
+                kind = _MANY_TO_MANY_THROUGH
+            spec.append((field.name, kind, serializer_class, model_class))
+
+        cls._nested_spec = tuple(spec)
+        return cls._nested_spec
+
+    def _attach_nested_fields(self):
+        expanding = _expanding.get() | {type(self)}
+        token = _expanding.set(expanding)
+        try:
+            self._attach_nested_spec(expanding)
+        finally:
+            _expanding.reset(token)
+
+    def _attach_nested_spec(self, expanding):
+        # Meta.fields is left as declared, the model fields are already built from it
+        for field_name, kind, serializer_class, model_class in self._get_nested_spec():
+            # Already being expanded further up, the relation keeps its model field
+            if serializer_class in expanding:
+                continue
+
+            # Read-only nested
+            if kind == _FOREIGN_KEY:
+                self.fields[field_name] = serializer_class(read_only=True)
+            else:
+                self.fields[field_name] = serializer_class(many=True, read_only=True)
+
             # Write fields
-            if isinstance(field, models.ManyToManyField):
-                if field.remote_field.through._meta.auto_created:
-                    self.fields[field_name + "_ids"] = serializers.PrimaryKeyRelatedField(
-                        many=True, queryset=model_class.objects.all(),
-                        source=field_name, write_only=True, required=False
-                    )
-                    meta_fields.append(field_name + "_ids")
-                else:
-                    self.fields[field_name + "_nested"] = serializer_class(
-                        many=True, write_only=True, required=False
-                    )
-                    meta_fields.append(field_name + "_nested")
+            if kind == _MANY_TO_MANY:
+                self.fields[field_name + "_ids"] = BulkPrimaryKeyRelatedField(
+                    many=True, queryset=model_class.objects.all(),
+                    source=field_name, write_only=True, required=False
+                )
+            elif kind == _MANY_TO_MANY_THROUGH:
+                self.fields[field_name + "_nested"] = serializer_class(
+                    many=True, write_only=True, required=False
+                )
             else:
                 self.fields[field_name + "_id"] = serializers.PrimaryKeyRelatedField(
                     queryset=model_class.objects.all(),
                     source=field_name, write_only=True, required=False
                 )
-                meta_fields.append(field_name + "_id")
 
-        self.Meta.fields = meta_fields
+    @classmethod
+    def _get_nested_keys(cls):
+        """
+        Get the validated data keys of the nested write fields, built once per class.
+        """
+        nested_keys = cls.__dict__.get("_nested_keys")
+        if nested_keys is None:
+            nested_keys = cls._nested_keys = frozenset(
+                field_name + "_nested" for field_name, _, _, _ in cls._get_nested_spec()
+            )
+        return nested_keys
 
     def _extract_nested_data(self, validated_data):
-        nested_data = {}
-        for key in list(validated_data.keys()):
-            if key.endswith("_nested"):
-                nested_data[key] = validated_data.pop(key)
-        return nested_data
+        return {key: validated_data.pop(key) for key in self._get_nested_keys() & validated_data.keys()}
 
     def _handle_nested_m2m(self, instance, nested_data):
-        for field_name, items in nested_data.items():
-            actual_field = field_name.replace("_nested", "")
-            rel_manager = getattr(instance, actual_field)
-            serializer_class = self.fields[actual_field].child
-
-            related_instances = []
-            for item in items:
-                obj_id = item.get('id')
-                if obj_id:
-                    # Update existing related object
-                    obj = serializer_class.Meta.model.objects.get(id=obj_id)
+        with transaction.atomic():
+            for field_name, items in nested_data.items():
+                actual_field = field_name.replace("_nested", "")
+                rel_manager = getattr(instance, actual_field)
+                serializer_class = self.fields[actual_field].child
+                related_model = serializer_class.Meta.model
+
+                to_update = [item for item in items if item.get('id')]
+                to_create = [item for item in items if not item.get('id')]
+
+                # Update existing related objects, fetched in one query. Each is saved on its
+                # own so the model's save() and pre_save logic runs, bulk_update skips both
+                existing = related_model.objects.in_bulk([item['id'] for item in to_update])
+                updated = []
+                for item in to_update:
+                    obj = existing.get(item['id'])
+                    if obj is None:
+                        raise related_model.DoesNotExist(f"{related_model.__name__} with id {item['id']} does not exist.")
                     for attr, value in item.items():
                         setattr(obj, attr, value)
                     obj.save()
-                else:
-                    obj = serializer_class.Meta.model.objects.create(**item)
-                related_instances.append(obj)
-            rel_manager.set(related_instances)
+                    updated.append(obj)
+
+                # Create new related objects
+                new_objects = [related_model.objects.create(**item) for item in to_create]
+
+                rel_manager.set(updated + new_objects)
 
     def _handle_nested_fk_o2o(self, validated_data):
-        for field in self.Meta.model._meta.get_fields():
-            if not isinstance(field, (models.ForeignKey, models.OneToOneField)):
-                continue
+        # Collect the nested payloads first so each related model is read and written once
+        to_update, to_create = {}, {}
+        foreign_key_fields, _ = _get_relation_fields(self.Meta.model)
+        for field in foreign_key_fields:
             field_name = field.name
             nested_field = field_name + "_nested"
             if nested_field in validated_data:
@@ -109,15 +402,31 @@ class NestedSerializer(serializers.ModelSerializer):
                 if data is None:
                     continue
                 serializer_class = self.fields[field_name].child if hasattr(self.fields[field_name], 'child') else self.fields[field_name]
-                obj_id = data.get('id')
-                if obj_id:
-                    obj = serializer_class.Meta.model.objects.get(id=obj_id)
+                related_model = serializer_class.Meta.model
+                if data.get('id'):
+                    to_update.setdefault(related_model, []).append((field_name, data))
+                else:
+                    to_create.setdefault(related_model, []).append((field_name, data))
+
+        if not to_update and not to_create:
+            return
+
+        with transaction.atomic():
+            for related_model, entries in to_update.items():
+                # One query per related model, each object is saved so its save() logic runs
+                existing = related_model.objects.in_bulk([data['id'] for _, data in entries])
+                for field_name, data in entries:
+                    obj = existing.get(data['id'])
+                    if obj is None:
+                        raise related_model.DoesNotExist(f"{related_model.__name__} with id {data['id']} does not exist.")
                     for attr, value in data.items():
                         setattr(obj, attr, value)
                     obj.save()
-                else:
-                    obj = serializer_class.Meta.model.objects.create(**data)
-                validated_data[field_name] = obj
+                    validated_data[field_name] = obj
+
+            for related_model, entries in to_create.items():
+                for field_name, data in entries:
+                    validated_data[field_name] = related_model.objects.create(**data)
 
     def create(self, validated_data):
         self._handle_nested_fk_o2o(validated_data)
@@ -141,6 +450,9 @@ class OptionModelSerializer(serializers.ModelSerializer):
 
 
 class BulkDeleteMixin:
+    bulk_delete_batch_size = 1000  # Maximum number of ids deleted per statement
+    bulk_delete_skip_signals = False  # Delete with a single SQL DELETE, without signals or ORM cascades
+
     @action(detail=False, methods=["post"], url_path="bulk-delete")
     def bulk_delete(self, request, *args, **kwargs):
         """
@@ -152,8 +464,16 @@ class BulkDeleteMixin:
             return Response({"detail": "Invalid or empty ids list."},
                             status=status.HTTP_400_BAD_REQUEST)
 
-        queryset = self.get_queryset().filter(id__in=ids)
-        deleted_count = queryset.count()
-        queryset.delete()
+        queryset = self.get_queryset()
+        deleted_count = 0
+        with transaction.atomic(using=queryset.db):
+            for start in range(0, len(ids), self.bulk_delete_batch_size):
+                batch = queryset.filter(id__in=ids[start:start + self.bulk_delete_batch_size])
+                if self.bulk_delete_skip_signals:
+                    deleted_count += batch._raw_delete(batch.db)
+                else:
+                    # Only the selected objects are counted, not the ones removed by cascades
+                    _, deleted_per_model = batch.delete()
+                    deleted_count += deleted_per_model.get(queryset.model._meta.label, 0)
 
         return Response({"deleted": deleted_count}, status=status.HTTP_200_OK)
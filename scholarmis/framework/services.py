@@ -1,7 +1,9 @@
 import inspect
 import logging
+import threading
 from abc import ABC, abstractmethod
 from contextlib import contextmanager
+from contextvars import ContextVar
 from typing import Any, Dict, List, Optional, Tuple, Type, TypeVar
 from .exceptions import ServiceAlreadyRegisteredError, ServiceResolutionError
 
@@ -51,9 +53,26 @@ class ServiceRegistry:
         
         # Tracks singleton instances for ordered lifecycle management
         self._singleton_order: List[Any] = []
+
+        # Singletons implementing IStartable / IStoppable, in creation order
+        self._startables: List[IStartable] = []
+        self._stoppables: List[IStoppable] = []
         
-        # Stack for managing nested scopes. Each scope is a dict: contract -> instance
-        self._scope_stack: List[Dict[Type, Any]] = []
+        # Guards creation of the per-contract locks below
+        self._singleton_lock = threading.Lock()
+
+        # One lock per singleton contract, so each singleton is instantiated only once
+        self._contract_locks: Dict[Type, threading.RLock] = {}
+
+        # Stack for managing nested scopes, per thread and per async context, so scopes
+        # opened in async code are seen by sync code run through sync_to_async.
+        # Each scope is a dict: contract -> instance
+        self._scope_stack: ContextVar[Tuple[Dict[Type, Any], ...]] = ContextVar(
+            f"scope_stack_{id(self)}", default=()
+        )
+
+        # Constructor dependencies per implementation: (parameter name, contract) pairs
+        self._plan_cache: Dict[Type, Tuple[Tuple[str, Type], ...]] = {}
 
         self._logger = logging.getLogger(self.__class__.__name__)
 
@@ -87,6 +106,14 @@ class ServiceRegistry:
             raise ValueError("Invalid lifetime. Use 'singleton', 'scoped' or 'transient'.")
 
         self._registry[contract] = (implementation, lifetime)
+
+        # Build the dependency plan now so the first resolution doesn't pay for it,
+        # a plan that can't be built is reported when the service is resolved
+        try:
+            self._get_plan(implementation)
+        except ServiceResolutionError:
+            pass
+
         self._logger.info(f"Registered {contract.__name__} -> {implementation.__name__} ({lifetime})")
 
     def register_singleton(self, contract: Type[Contract], implementation: Type[Contract]) -> None:
@@ -126,10 +153,21 @@ class ServiceRegistry:
         implementation, lifetime = self._registry[contract]
         
         if lifetime == LIFETIME_SINGLETON:
-            if contract not in self._singletons:
-                instance = self._instantiate(implementation)
-                self._singletons[contract] = instance
-                self._singleton_order.append(instance) # Track for shutdown
+            # Lock-free once the singleton exists
+            instance = self._singletons.get(contract)
+            if instance is not None:
+                return instance
+
+            with self._get_contract_lock(contract):
+                # Another thread may have created it while this one waited
+                if contract not in self._singletons:
+                    instance = self._instantiate(implementation)
+                    self._singletons[contract] = instance
+                    self._singleton_order.append(instance) # Track for shutdown
+                    if isinstance(instance, IStartable):
+                        self._startables.append(instance)
+                    if isinstance(instance, IStoppable):
+                        self._stoppables.append(instance)
             return self._singletons[contract]
             
         elif lifetime == LIFETIME_SCOPED:
@@ -157,15 +195,35 @@ class ServiceRegistry:
         
         This private method handles the heavy lifting of Dependency Injection.
         """
+        plan = self._get_plan(implementation)
+
+        # Recursive call to resolve dependencies
+        dependencies = {name: self.get(dependency) for name, dependency in plan}
+        return implementation(**dependencies)
+
+    def _get_plan(self, implementation: Type) -> Tuple[Tuple[str, Type], ...]:
+        """
+        Returns the (parameter name, contract) pairs of the implementation's constructor,
+        reading its signature once and caching the result.
+        """
+        plan = self._plan_cache.get(implementation)
+        if plan is not None:
+            return plan
+
+        if implementation.__init__ is object.__init__:
+            # Inherits object's __init__, whose (*args, **kwargs) signature declares no dependencies
+            self._plan_cache[implementation] = ()
+            return ()
+
         try:
             # Use inspect.signature to get constructor's parameters
             sig = inspect.signature(implementation.__init__)
             params = sig.parameters
         except (ValueError, AttributeError):
             # No __init__ method or trivial init, so no dependencies to resolve
-            return implementation()
+            params = {}
 
-        dependencies: Dict[str, Any] = {}
+        dependencies: List[Tuple[str, Type]] = []
         for name, param in params.items():
             if name == 'self':
                 continue
@@ -175,14 +233,24 @@ class ServiceRegistry:
                     f"Missing type hint for dependency '{name}' in {implementation.__name__}'s constructor."
                 )
             
-            # Recursive call to resolve dependencies
-            dependencies[name] = self.get(param.annotation)
-            
-        return implementation(**dependencies)
+            dependencies.append((name, param.annotation))
+
+        plan = tuple(dependencies)
+        self._plan_cache[implementation] = plan
+        return plan
+
+    def _get_contract_lock(self, contract: Type) -> threading.RLock:
+        """Returns the lock guarding a singleton's creation, re-entrant so a dependency cycle fails instead of blocking."""
+        lock = self._contract_locks.get(contract)
+        if lock is None:
+            with self._singleton_lock:
+                lock = self._contract_locks.setdefault(contract, threading.RLock())
+        return lock
 
     def _get_current_scope(self) -> Optional[Dict[Type, Any]]:
         """Returns the current scope from the stack, if one exists."""
-        return self._scope_stack[-1] if self._scope_stack else None
+        scope_stack = self._scope_stack.get()
+        return scope_stack[-1] if scope_stack else None
 
     @contextmanager
     def create_scope(self):
@@ -193,7 +261,7 @@ class ServiceRegistry:
         context and destroyed on exit.
         """
         scope: Dict[Type, Any] = {}
-        self._scope_stack.append(scope)
+        token = self._scope_stack.set(self._scope_stack.get() + (scope,))
         try:
             self._logger.debug("Scope created.")
             yield
@@ -207,7 +275,11 @@ class ServiceRegistry:
                 except Exception as exc:
                     self._logger.exception(f"Error stopping scoped instance {instance.__class__.__name__}: {exc}")
             
-            self._scope_stack.pop()
+            try:
+                self._scope_stack.reset(token)
+            except ValueError:
+                # Exited from another context, drop this scope from that context's stack
+                self._scope_stack.set(tuple(item for item in self._scope_stack.get() if item is not scope))
             self._logger.debug("Scope destroyed.")
 
     # --- Lifecycle Management ---
@@ -224,14 +296,13 @@ class ServiceRegistry:
             if lifetime == LIFETIME_SINGLETON and contract not in self._singletons:
                 self.get(contract)
                 
-        for inst in self._singleton_order:
-            if isinstance(inst, IStartable):
-                try:
-                    inst.start()
-                    self._logger.info(f"Started service: {inst.__class__.__name__}")
-                except Exception as exc:
-                    self._logger.error(f"Failed to start singleton {inst.__class__.__name__}.")
-                    raise
+        for inst in self._startables:
+            try:
+                inst.start()
+                self._logger.info(f"Started service: {inst.__class__.__name__}")
+            except Exception as exc:
+                self._logger.error(f"Failed to start singleton {inst.__class__.__name__}.")
+                raise
 
     def stop_singletons(self) -> None:
         """
@@ -241,14 +312,13 @@ class ServiceRegistry:
         in the reverse order of their creation.
         """
         self._logger.info("Stopping singleton services...")
-        for inst in reversed(self._singleton_order):
-            if isinstance(inst, IStoppable):
-                try:
-                    inst.stop()
-                    self._logger.info(f"Stopped service: {inst.__class__.__name__}")
-                except Exception as exc:
-                    self._logger.error(f"Failed to stop singleton {inst.__class__.__name__}.")
-                    raise
+        for inst in reversed(self._stoppables):
+            try:
+                inst.stop()
+                self._logger.info(f"Stopped service: {inst.__class__.__name__}")
+            except Exception as exc:
+                self._logger.error(f"Failed to stop singleton {inst.__class__.__name__}.")
+                raise
 
 
 service_registry = ServiceRegistry()
\ No newline at end of file
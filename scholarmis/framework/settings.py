@@ -1,9 +1,46 @@
 import json
 from django.apps import AppConfig # type: ignore
+from django.db import transaction # type: ignore
 from django.db.models import Model # type: ignore
+from django.db.models.signals import post_delete, post_save # type: ignore
 from django.core.cache import cache # type: ignore
 
 
+# Rows fetched per round trip when reading a whole settings table
+_CHUNK_SIZE = 2000
+
+# Returned by the cache when the settings are not cached, unlike any cached value
+_MISS = object()
+
+
+def _all_settings_cache_key(model) -> str:
+    # One cache entry holds every setting of a settings model
+    return f"global_settings_all_{model._meta.label_lower}"
+
+
+def _cached_value(setting):
+    """The value kept in the cache for a setting, with list settings already decoded."""
+    value = setting.get_value()
+    if setting.data_type == "list" and isinstance(value, str):
+        try:
+            return json.loads(value)
+        except ValueError:
+            pass
+    return value
+
+
+def _stored_value(value, data_type) -> str:
+    """The text saved in the setting_value column, lists are saved as JSON."""
+    if data_type == "list" and not isinstance(value, str):
+        return json.dumps(value)
+    return str(value)
+
+
+def _invalidate_all_settings(sender, **kwargs):
+    """Drop the cached settings of a settings model when one of its rows changes."""
+    cache.delete(_all_settings_cache_key(sender))
+
+
 class GlobalSettingsLoader:
     """
     A class to load and manage global settings from the database with optional caching.
@@ -14,19 +51,26 @@ class GlobalSettingsLoader:
         cache_timeout (int): Duration (in seconds) for which cached settings are valid.
     """
 
-    def __init__(self, model: Model, use_cache: bool=True, cache_timeout:int=300):
+    def __init__(self, model: Model, use_cache: bool=True, cache_timeout:int=86400):
         """
         Initializes the GlobalSettingsLoader with specified caching options.
 
         Args:
             model (Model): a model to save and load settings from.
             use_cache (bool): Indicates whether to use caching. Defaults to True.
-            cache_timeout (int): Duration in seconds for cached settings. Defaults to 300 seconds.
+            cache_timeout (int): Duration in seconds for cached settings. Defaults to 86400 seconds (a day).
         """
         self.model = model
         self.use_cache = use_cache
         self.cache_timeout = cache_timeout
 
+        if use_cache:
+            # Writes made outside the loader invalidate the cached settings too, so the
+            # timeout only bounds staleness from writes that send no signals (update(), bulk ops)
+            dispatch_uid = _all_settings_cache_key(model)
+            post_save.connect(_invalidate_all_settings, sender=model, dispatch_uid=dispatch_uid)
+            post_delete.connect(_invalidate_all_settings, sender=model, dispatch_uid=dispatch_uid)
+
     def get_setting(self, key, default=None):
         """
         Retrieves a global setting by its key.
@@ -51,6 +95,60 @@ class GlobalSettingsLoader:
         """
         return self._set_setting(key, value, data_type)
 
+    def get_many(self, keys, default=None):
+        """
+        Retrieves several global settings at once, with one cache lookup or one query.
+
+        Args:
+            keys (list): The keys of the settings to retrieve.
+            default: The value for the keys that are not found.
+
+        Returns:
+            dict: The setting values by their keys.
+        """
+        if self.use_cache:
+            settings = self._load_all()
+        else:
+            model = self.get_model()
+            settings = {setting.setting_key: (setting, None) for setting in model.objects.filter(setting_key__in=keys)}
+
+        values = {}
+        for key in keys:
+            entry = settings.get(key)
+            values[key] = entry[0].get_value() if entry is not None else default
+        return values
+
+    def set_many(self, values, data_type="str"):
+        """
+        Sets several global settings at once, updating the existing ones and creating
+        the others with one statement each.
+
+        Args:
+            values (dict): The values to set by their keys.
+            data_type (str): The type of the values being set. Defaults to "str".
+        """
+        model = self.get_model()
+        with transaction.atomic():
+            existing = {setting.setting_key: setting for setting in model.objects.filter(setting_key__in=list(values))}
+            to_update, to_create = [], []
+            for key, value in values.items():
+                setting = existing.get(key)
+                if setting is None:
+                    to_create.append(model(setting_key=key, setting_value=_stored_value(value, data_type), data_type=data_type))
+                else:
+                    setting.setting_value = _stored_value(value, data_type)
+                    setting.data_type = data_type
+                    to_update.append(setting)
+
+            if to_update:
+                model.objects.bulk_update(to_update, ["setting_value", "data_type"])
+            if to_create:
+                model.objects.bulk_create(to_create)
+
+        # Bulk writes send no signals, so the cached settings are dropped here
+        if self.use_cache:
+            cache.delete(_all_settings_cache_key(model))
+
     def get_int(self, key:str, default=0):
         """
         Retrieves a global setting as an integer.
@@ -144,7 +242,7 @@ class GlobalSettingsLoader:
             key (str): The key of the setting to set.
             value (list): The list value to set for the setting.
         """
-        return self._set_setting(key, json.dumps(value), data_type="list")
+        return self._set_setting(key, value, data_type="list")
     
     def get_setting_from_options(self, key, default=None):
         """
@@ -188,6 +286,28 @@ class GlobalSettingsLoader:
         """
         return self.model
 
+    def _load_all(self, refresh=False):
+        """
+        Retrieves every setting object in one query, keyed by setting key, and caches
+        them under a single key together with their values. Keys missing from it are
+        not set, so looking them up again does not query either.
+
+        Args:
+            refresh (bool): Load the settings from the database even if they are cached.
+
+        Returns:
+            dict: The (setting object, value) pairs by their keys.
+        """
+        cache_key = _all_settings_cache_key(self.get_model())
+        settings = _MISS if refresh else cache.get(cache_key, _MISS)
+        if settings is _MISS:
+            settings = {
+                setting.setting_key: (setting, _cached_value(setting))
+                for setting in self.get_model().objects.iterator(chunk_size=_CHUNK_SIZE)
+            }
+            cache.set(cache_key, settings, self.cache_timeout)
+        return settings
+
     def _get_setting_object(self, key):
         """
         Retrieves a global setting object by its key, using cache if enabled.
@@ -199,16 +319,11 @@ class GlobalSettingsLoader:
             The GlobalSetting object if found; otherwise, None.
         """
         if self.use_cache:
-            cache_key = f"global_{key}_object"
-            cached_setting = cache.get(cache_key)
-            if cached_setting is not None:
-                return cached_setting
+            entry = self._load_all().get(key)
+            return entry[0] if entry is not None else None
         try:
             model = self.get_model()
-            setting = model.objects.get(setting_key=key)
-            if self.use_cache:
-                cache.set(f"global_{key}_object", setting, self.cache_timeout)
-            return setting
+            return model.objects.get(setting_key=key)
         except model.DoesNotExist:
             return None
 
@@ -225,24 +340,15 @@ class GlobalSettingsLoader:
             The value of the setting or the default value.
         """
         if self.use_cache:
-            cache_key = f"global_{key}"
-            cached_value = cache.get(cache_key)
-            if cached_value is not None:
-                return cached_value
-        try:
-            model = self.get_model()
-            setting = model.objects.get(setting_key=key)
-            if setting.data_type == data_type:
-                value = setting.get_value()
-            else:
-                value = default
-        except model.DoesNotExist:
-            value = default
-
-        if self.use_cache:
-            cache.set(f"global_{key}", value, self.cache_timeout)
+            entry = self._load_all().get(key)
+            if entry is not None and entry[0].data_type == data_type:
+                return entry[1]
+            return default
 
-        return value
+        setting = self._get_setting_object(key)
+        if setting is not None and setting.data_type == data_type:
+            return setting.get_value()
+        return default
 
     def _set_setting(self, key, value, data_type="str"):
         """
@@ -254,13 +360,22 @@ class GlobalSettingsLoader:
             data_type (str): The type of the value being set. Defaults to "str".
         """
         model = self.get_model()
-        setting, created = model.objects.get_or_create(setting_key=key)
-        setting.setting_value = str(value)
-        setting.data_type = data_type
-        setting.save()
+        model.objects.update_or_create(
+            setting_key=key, defaults={"setting_value": _stored_value(value, data_type), "data_type": data_type}
+        )
 
         if self.use_cache:
-            cache.set(f"global_{key}", setting.get_value(), self.cache_timeout)
+            cache.delete(_all_settings_cache_key(model))
+
+    def warm_cache(self):
+        """
+        Loads every setting into the cache, so the first requests after a deploy
+        read them from the cache too. Call it once the database is available, for
+        instance from a post_migrate handler or a deploy command, since Django
+        discourages queries in AppConfig.ready(). Does nothing without caching.
+        """
+        if self.use_cache:
+            self._load_all(refresh=True)
 
     def get_all_settings(self):
         """
@@ -269,8 +384,10 @@ class GlobalSettingsLoader:
         Returns:
             dict: A dictionary of all setting keys and their values.
         """
-        model = self.get_model()
-        settings = model.objects.all()
+        if self.use_cache:
+            settings = (setting for setting, _ in self._load_all().values())
+        else:
+            settings = self.get_model().objects.iterator(chunk_size=_CHUNK_SIZE)
         return {setting.setting_key: setting.get_value() for setting in settings}
 
 
@@ -284,17 +401,18 @@ class AppSettingsLoader(GlobalSettingsLoader):
         app (AppConfig): The application for which settings are managed.
     """
     
-    def __init__(self, app:AppConfig, model:Model, use_cache:bool=True, cache_timeout:int=300):
+    def __init__(self, app:AppConfig, model:Model, use_cache:bool=True, cache_timeout:int=86400):
         """
         Initializes the AppSettingsLoader with specified application and caching options.
 
         Args:
             app (AppConfig): The application for which settings are managed.
             use_cache (bool): Indicates whether to use caching. Defaults to True.
-            cache_timeout (int): Duration in seconds for cached settings. Defaults to 300 seconds.
+            cache_timeout (int): Duration in seconds for cached settings. Defaults to 86400 seconds (a day).
         """
         super().__init__(model, use_cache, cache_timeout)
         self.app = app
+        self._prefix = f"{app.name}."  # Prepended to the keys of the application's settings
 
     def get_setting(self, key, default=None):
         """
@@ -307,8 +425,7 @@ class AppSettingsLoader(GlobalSettingsLoader):
         Returns:
             The value of the application-specific setting or the default value.
         """
-        app_key = f"{self.app.name}.{key}"
-        return super().get_setting(app_key, default)
+        return super().get_setting(self._prefix + key, default)
 
     def set_setting(self, key, value, data_type="str"):
         """
@@ -319,8 +436,7 @@ class AppSettingsLoader(GlobalSettingsLoader):
             value: The value to set for the application-specific setting.
             data_type (str): The type of the value being set. Defaults to "str".
         """
-        app_key = f"{self.app.name}.{key}"
-        return super().set_setting(app_key, value, data_type)
+        return super().set_setting(self._prefix + key, value, data_type)
 
     def get_all_settings(self):
         """
@@ -329,6 +445,9 @@ class AppSettingsLoader(GlobalSettingsLoader):
         Returns:
             dict: A dictionary of all setting keys and their values for the application.
         """
-        model = self.get_model()
-        settings = model.objects.filter(setting_key__startswith=f"{self.app.name}.")
+        prefix = self._prefix
+        if self.use_cache:
+            settings = [setting for key, (setting, _) in self._load_all().items() if key.startswith(prefix)]
+        else:
+            settings = self.get_model().objects.filter(setting_key__startswith=prefix).iterator(chunk_size=_CHUNK_SIZE)
         return {setting.setting_key: setting.get_value() for setting in settings}
@@ -2,47 +2,41 @@ import os
 from uuid import uuid4
 from django_tenants.utils import connection
 from django.core.files.storage import FileSystemStorage # type: ignore
-from django.core.files.base import ContentFile # type: ignore
 from django.conf import settings # type: ignore
+from django.utils._os import safe_join # type: ignore
 
 
-class MediaStorage(FileSystemStorage):
-    """
-    A custom file storage class for handling tenant-specific media uploads in a 
-    Django project using django-tenants. It stores uploaded files in tenant-specific 
-    directories and allows for optional renaming of the uploaded files.
-    """
+def _directory_url(url: str) -> str:
+    """Return the URL ending with exactly one slash."""
+    return url.rstrip("/") + "/"
 
-    def __init__(self, *args, **kwargs):
-        """
-        Initialize the MediaStorage by setting the appropriate media root and URL 
-        based on the current tenant's schema name.
-        """
 
-        # Define tenant-specific media directory
-        location = f"{settings.MEDIA_ROOT}/"
-        base_url = f"{settings.MEDIA_URL}/"
-        super().__init__(location=location, base_url=base_url, *args, **kwargs)
+class _BaseMediaStorage(FileSystemStorage):
+    """
+    The upload and path handling shared by the media storages. Subclasses set the
+    location and base URL in __init__.
+    """
 
     def url(self, name):
         """
-        Generates a URL that includes the tenant schema name in the media URL.
+        Generates the URL of the file under the storage's media URL.
         """
         return f"{self.base_url}{name}"
 
     def path(self, name):
         """
-        Ensure the path includes the tenant schema directory when accessing the file.
+        Builds the file system path of the file under the storage's media directory.
         """
+        # The location ends with a separator; os.path.join would drop it for names starting with "/"
         return f"{self.base_location}{name}"
 
     def upload(self, uploaded_file, upload_path: str = "uploads", rename: bool = True) -> str:
         """
-        Upload a file to the tenant-specific media directory, optionally renaming it.
+        Upload a file to the storage's media directory, optionally renaming it.
 
         Args:
             uploaded_file (UploadedFile): The file being uploaded.
-            upload_path (str, optional): Subdirectory within the tenant's media directory 
+            upload_path (str, optional): Subdirectory within the media directory 
                 where the file should be uploaded. Defaults to uploads.
             rename (bool, optional): If True, the file will be renamed using a UUID. 
                 Defaults to True.
@@ -54,16 +48,16 @@ class MediaStorage(FileSystemStorage):
 
         # Optionally rename the file using a UUID
         if rename:
-            file_extension = os.path.splitext(uploaded_file.name)[1]
-            file_name = f"{uuid4()}{file_extension}"
+            file_extension = os.path.splitext(file_name)[1]
+            file_name = f"{uuid4().hex}{file_extension}"
 
         # If an upload path is provided, ensure the directory exists
         if upload_path:
             self._make_upload_path(upload_path)
             file_name = f'{upload_path}/{file_name}'
 
-        # Save the uploaded file and return its saved path
-        saved_file = self.save(file_name, ContentFile(uploaded_file.read()))
+        # Save the uploaded file, written in chunks, and return its saved path
+        saved_file = self.save(file_name, uploaded_file)
         
         return self.path(saved_file)
 
@@ -78,20 +72,21 @@ class MediaStorage(FileSystemStorage):
         Args:
             upload_path (str): The path to the directory to be created.
         """
-        # Create a dummy file to force the creation of the directory if it doesn't exist
-        dummy_file_path = f'{upload_path.rstrip("/")}/.dummy'
-
-        # Save an empty file (this will create the directory if it doesn't exist)
-        if not self.exists(dummy_file_path):
-            self.save(dummy_file_path, ContentFile(''))
-        
-        # Remove the dummy file after creating the directory
-        if self.exists(dummy_file_path):
-            self.delete(dummy_file_path)
+        # Create the directory directly, joined safely so it can't leave the media directory
+        directory = safe_join(self.base_location, upload_path)
 
+        # Apply the directory permissions the same way FileSystemStorage does when saving
+        if self.directory_permissions_mode is not None:
+            old_umask = os.umask(0o777 & ~self.directory_permissions_mode)
+            try:
+                os.makedirs(directory, self.directory_permissions_mode, exist_ok=True)
+            finally:
+                os.umask(old_umask)
+        else:
+            os.makedirs(directory, exist_ok=True)
 
 
-class TenantMediaStorage(FileSystemStorage):
+class MediaStorage(_BaseMediaStorage):
     """
     A custom file storage class for handling tenant-specific media uploads in a 
     Django project using django-tenants. It stores uploaded files in tenant-specific 
@@ -100,82 +95,38 @@ class TenantMediaStorage(FileSystemStorage):
 
     def __init__(self, *args, **kwargs):
         """
-        Initialize the TenantMediaStorage by setting the appropriate media root and URL 
+        Initialize the MediaStorage by setting the appropriate media root and URL 
         based on the current tenant's schema name.
-
-        Args:
-            request (HttpRequest, optional): If passed, will use the tenant from the request. 
-                Otherwise, uses the tenant schema from the current connection.
         """
 
-        self.schema_name = connection.schema_name
-
         # Define tenant-specific media directory
-        location = f"{settings.MEDIA_ROOT}/{self.schema_name}/"
-        base_url = f"{settings.MEDIA_URL}{self.schema_name}/"
+        # Both end with a single separator, so names are appended without doubling it
+        location = os.path.join(settings.MEDIA_ROOT, "")
+        base_url = _directory_url(settings.MEDIA_URL)
         super().__init__(location=location, base_url=base_url, *args, **kwargs)
 
-    def url(self, name):
-        """
-        Generates a URL that includes the tenant schema name in the media URL.
-        """
-        return f"{self.base_url}{name}"
 
-    def path(self, name):
-        """
-        Ensure the path includes the tenant schema directory when accessing the file.
-        """
-        return f"{self.base_location}{name}"
+class TenantMediaStorage(_BaseMediaStorage):
+    """
+    A custom file storage class for handling tenant-specific media uploads in a 
+    Django project using django-tenants. It stores uploaded files in tenant-specific 
+    directories and allows for optional renaming of the uploaded files.
+    """
 
-    def upload(self, uploaded_file, upload_path: str = "uploads", rename: bool = True) -> str:
+    def __init__(self, *args, **kwargs):
         """
-        Upload a file to the tenant-specific media directory, optionally renaming it.
+        Initialize the TenantMediaStorage by setting the appropriate media root and URL 
+        based on the current tenant's schema name.
 
         Args:
-            uploaded_file (UploadedFile): The file being uploaded.
-            upload_path (str, optional): Subdirectory within the tenant's media directory 
-                where the file should be uploaded. Defaults to uploads.
-            rename (bool, optional): If True, the file will be renamed using a UUID. 
-                Defaults to True.
-
-        Returns:
-            str: The path where the file has been saved.
-        """
-        file_name = uploaded_file.name
-
-        # Optionally rename the file using a UUID
-        if rename:
-            file_extension = os.path.splitext(uploaded_file.name)[1]
-            file_name = f"{uuid4()}{file_extension}"
-
-        # If an upload path is provided, ensure the directory exists
-        if upload_path:
-            self._make_upload_path(upload_path)
-            file_name = f'{upload_path}/{file_name}'
-
-        # Save the uploaded file and return its saved path
-        saved_file = self.save(file_name, ContentFile(uploaded_file.read()))
-        
-        return self.path(saved_file)
-
-    def storage_path(self, path):
-        self._make_upload_path(path)
-        return self.path(path)
-
-    def _make_upload_path(self, upload_path: str) -> None:
+            request (HttpRequest, optional): If passed, will use the tenant from the request. 
+                Otherwise, uses the tenant schema from the current connection.
         """
-        Ensure the specified upload directory exists by creating it if necessary.
 
-        Args:
-            upload_path (str): The path to the directory to be created.
-        """
-        # Create a dummy file to force the creation of the directory if it doesn't exist
-        dummy_file_path = f'{upload_path.rstrip("/")}/.dummy'
+        self.schema_name = connection.schema_name
 
-        # Save an empty file (this will create the directory if it doesn't exist)
-        if not self.exists(dummy_file_path):
-            self.save(dummy_file_path, ContentFile(''))
-        
-        # Remove the dummy file after creating the directory
-        if self.exists(dummy_file_path):
-            self.delete(dummy_file_path)
+        # Define tenant-specific media directory
+        # Both end with a single separator, so names are appended without doubling it
+        location = os.path.join(settings.MEDIA_ROOT, self.schema_name, "")
+        base_url = _directory_url(f"{_directory_url(settings.MEDIA_URL)}{self.schema_name}")
+        super().__init__(location=location, base_url=base_url, *args, **kwargs)
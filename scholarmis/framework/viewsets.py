@@ -1,7 +1,33 @@
 from rest_framework import viewsets
 from scholarmis.framework.paginators import Pagination
 
-class OptionModelViewSet(viewsets.ModelViewSet):
+
+class RelatedLoading:
+    """
+    Join and prefetch the relations named by the view, so serializing a page
+    does not query once per row, and optionally load only the columns it uses.
+
+    only_fields has to name every column the serializer reads; a column left out is
+    fetched again for each row that reads it. It must include the foreign keys in
+    select_related_fields, Django does not join a deferred foreign key.
+    """
+    select_related_fields = ()  # Foreign keys joined in the same query
+    prefetch_related_fields = ()  # Many-valued relations fetched in one extra query each
+    only_fields = ()  # Columns loaded, all of them if empty
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        # Without arguments select_related() would follow every foreign key
+        if self.select_related_fields:
+            queryset = queryset.select_related(*self.select_related_fields)
+        if self.prefetch_related_fields:
+            queryset = queryset.prefetch_related(*self.prefetch_related_fields)
+        if self.only_fields:
+            queryset = queryset.only(*self.only_fields)
+        return queryset
+
+
+class OptionModelViewSet(RelatedLoading, viewsets.ModelViewSet):
     """
     Generic ViewSet for OptionModels
     """
@@ -11,5 +37,5 @@ class OptionModelViewSet(viewsets.ModelViewSet):
     ordering = ["name"]
 
 
-class BaseModelViewSet(viewsets.ModelViewSet):
-    pagination_class = Pagination
\ No newline at end of file
+class BaseModelViewSet(RelatedLoading, viewsets.ModelViewSet):
+    pagination_class = Pagination